@@ -0,0 +1,79 @@
+"""Compliance highlight annotation for section drafts.
+
+Shared by the page handlers (on-the-fly fallback) and the pipeline,
+which caches the result on section_drafts.annotated_content.
+"""
+
+import html as html_lib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Highlight markup built once; the per-flag loop only fills in the
+# severity class, flag id and matched text.
+_REPLACEMENT_TMPL = (
+    '<span class="compliance-highlight compliance-highlight--{sev}" '
+    'data-flag-id="{fid}">'
+    '{text}'
+    '<span class="compliance-indicator compliance-indicator--{sev}" '
+    'data-flag-id="{fid}"></span>'
+    '</span>'
+)
+
+
+def annotate_content(content: str, flags: list[dict]) -> str:
+    """HTML-escape content and insert compliance highlight spans.
+
+    Locates every flag's match in the escaped content first (longest
+    matched_text claims its range first, overlaps are dropped), then
+    builds the output in a single join — the escaped string is never
+    mutated, so no offset-shift bookkeeping is needed.
+    """
+    escaped = html_lib.escape(content)
+
+    # Sort flags by matched_text length descending (longest first)
+    sorted_flags = sorted(flags, key=lambda f: len(f.get("matched_text", "")), reverse=True)
+
+    # (start, end, flag, escaped_match) for each non-overlapping match
+    spans: list[tuple[int, int, dict, str]] = []
+
+    for flag in sorted_flags:
+        matched_text = flag.get("matched_text", "")
+        if not matched_text:
+            continue
+
+        # HTML-escape the matched text so it matches the escaped content
+        escaped_match = html_lib.escape(matched_text)
+        start = escaped.find(escaped_match)
+        if start == -1:
+            continue
+        end = start + len(escaped_match)
+
+        # Check for overlap with already-claimed ranges
+        if any(start < e and end > s for s, e, _, _ in spans):
+            logger.debug(
+                "Flag %d skipped inline highlight (overlaps existing annotation)",
+                flag["id"],
+            )
+            continue
+
+        spans.append((start, end, flag, escaped_match))
+
+    if not spans:
+        return escaped
+
+    spans.sort(key=lambda span: span[0])
+
+    parts: list[str] = []
+    cursor = 0
+    for start, end, flag, escaped_match in spans:
+        parts.append(escaped[cursor:start])
+        parts.append(_REPLACEMENT_TMPL.format(
+            sev=flag["severity"].lower().replace("_", "-"),
+            fid=flag["id"],
+            text=escaped_match,
+        ))
+        cursor = end
+    parts.append(escaped[cursor:])
+
+    return "".join(parts)
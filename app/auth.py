@@ -1,51 +1,157 @@
+import base64
+import hashlib
 import hmac
 import logging
+import struct
+import time
 
 from fastapi import Request
-from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-_serializer = URLSafeTimedSerializer(settings.secret_key)
+_SECRET = settings.secret_key.encode("utf-8")
 _SESSION_COOKIE = "session"
 _MAX_AGE = 86400  # 24 hours
+_MAC_LEN = 16  # truncated HMAC-SHA256 tag
+
+# Fixed-layout token header: issued_at (u32), len(username) (u16),
+# len(display_name) (u16). Pack/unpack is a single C call — no string
+# splitting or JSON tokenizing on the verify path.
+_HEADER = struct.Struct("<IHH")
 
 
 class AuthRequired(Exception):
     """Raised when a valid session is not present."""
 
 
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_SECRET, payload, hashlib.sha256).digest()[:_MAC_LEN]
+
+
 def create_session(username: str, display_name: str) -> str:
-    """Create a signed session cookie value."""
-    return _serializer.dumps({"username": username, "display_name": display_name})
+    """Create a signed session cookie value.
+
+    The token is base64(header + username + display_name + mac) with a
+    struct-packed fixed header and a truncated HMAC-SHA256 tag — no JSON
+    or pickle round-trip on the hot path.
+    """
+    u = username.encode("utf-8")
+    d = display_name.encode("utf-8")
+    payload = _HEADER.pack(int(time.time()), len(u), len(d)) + u + d
+    return base64.urlsafe_b64encode(payload + _sign(payload)).decode("ascii")
+
+
+# Verified-session cache: cookie value -> (user dict, issued_at).
+# Verification is a pure function of (cookie, secret), so a hit replaces
+# the base64 + HMAC work with one dict probe. Expiry is still re-checked
+# against the wall clock on every hit.
+_SESSION_CACHE_MAX = 1024
+_session_cache: dict[str, tuple[dict[str, str], int]] = {}
+
+
+def invalidate_session(cookie_value: str) -> None:
+    """Evict a cookie from the verified-session cache (used on logout)."""
+    _session_cache.pop(cookie_value, None)
 
 
 def verify_session(cookie_value: str) -> dict[str, str] | None:
     """Verify and decode a session cookie. Returns user dict or None."""
+    cached = _session_cache.get(cookie_value)
+    if cached is not None:
+        user, issued_at = cached
+        if 0 <= time.time() - issued_at <= _MAX_AGE:
+            return user
+        del _session_cache[cookie_value]
+        return None
+    try:
+        blob = base64.urlsafe_b64decode(cookie_value.encode("ascii"))
+    except (ValueError, UnicodeEncodeError):
+        return None
+    if len(blob) <= _MAC_LEN:
+        return None
+    payload, mac = blob[:-_MAC_LEN], blob[-_MAC_LEN:]
+    if not hmac.compare_digest(mac, _sign(payload)):
+        return None
+    try:
+        issued_at, len_user, len_display = _HEADER.unpack_from(payload)
+    except struct.error:
+        return None
+    if len(payload) != _HEADER.size + len_user + len_display:
+        return None
     try:
-        data = _serializer.loads(cookie_value, max_age=_MAX_AGE)
-        return data
-    except (BadSignature, SignatureExpired):
+        username = payload[_HEADER.size:_HEADER.size + len_user].decode("utf-8")
+        display_name = payload[_HEADER.size + len_user:].decode("utf-8")
+    except UnicodeDecodeError:
         return None
+    if not 0 <= time.time() - issued_at <= _MAX_AGE:
+        return None
+    user = {"username": username, "display_name": display_name}
+    if len(_session_cache) >= _SESSION_CACHE_MAX:
+        # Drop the oldest entry (insertion order) to bound memory
+        _session_cache.pop(next(iter(_session_cache)))
+    _session_cache[cookie_value] = (user, issued_at)
+    return user
+
+
+# Accounts with passwords pre-encoded to bytes so compare_digest takes
+# its fast C path without a str->bytes conversion per login attempt.
+_ACCOUNTS: dict[str, tuple[bytes, str]] = {
+    username: (account["password"].encode("utf-8"), account["display_name"])
+    for username, account in settings.partner_accounts.items()
+}
+
+# Stand-in secret compared against when the username is unknown, so the
+# compare_digest call runs on every attempt and response timing does not
+# leak which usernames exist.
+_DUMMY_PASSWORD = b"x" * 64
 
 
 def authenticate(username: str, password: str) -> dict[str, str] | None:
-    """Validate credentials against partner accounts. Returns user dict or None."""
-    accounts = settings.get_partner_accounts()
-    account = accounts.get(username)
-    if account and account["password"] and hmac.compare_digest(account["password"], password):
-        return {"username": username, "display_name": account["display_name"]}
+    """Validate credentials against partner accounts. Returns user dict or None.
+
+    Always runs the constant-time comparison, even for unknown usernames
+    or unset passwords, to avoid a username-existence timing leak.
+    """
+    account = _ACCOUNTS.get(username)
+    stored = account[0] if account and account[0] else _DUMMY_PASSWORD
+    ok = hmac.compare_digest(stored, password.encode("utf-8"))
+    if ok and account and account[0]:
+        return {"username": username, "display_name": account[1]}
+    return None
+
+
+def _session_cookie_value(request: Request) -> str | None:
+    """Pull the session cookie straight from the Cookie header.
+
+    Avoids parsing the full header into a dict when only one cookie is
+    needed. Session tokens are base64, so no unquoting is required.
+    """
+    header = request.headers.get("cookie")
+    if not header:
+        return None
+    for part in header.split(";"):
+        name, sep, value = part.strip().partition("=")
+        if sep and name == _SESSION_COOKIE:
+            return value
     return None
 
 
 async def get_current_user(request: Request) -> dict[str, str]:
-    """FastAPI dependency. Returns user dict or raises AuthRequired."""
-    cookie = request.cookies.get(_SESSION_COOKIE)
+    """FastAPI dependency. Returns user dict or raises AuthRequired.
+
+    The verified user is cached on request.state so routes with multiple
+    dependencies parse the cookie at most once per request.
+    """
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+    cookie = _session_cookie_value(request)
     if not cookie:
         raise AuthRequired()
     user = verify_session(cookie)
     if not user:
         raise AuthRequired()
+    request.state.user = user
     return user
@@ -1,5 +1,8 @@
+import json
 import logging
+from functools import cached_property
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 _logger = logging.getLogger(__name__)
@@ -16,16 +19,25 @@ class Settings(BaseSettings):
     partner_2_password: str = ""
     partner_2_display_name: str = "Juliana Soto"
 
+    # Optional single-block override: JSON mapping username ->
+    # {"password": ..., "display_name": ...}. When set, it replaces the
+    # PARTNER_N_* fields above and is parsed exactly once at startup.
+    partners_json: str = ""
+
     # Session signing
     secret_key: str = "change-me-in-production"
 
     # LLM
     gemini_api_key: str = ""
+    gemini_concurrency: int = 3
+    gemini_timeout_s: int = 60
 
     # Data sources
     perplexity_api_key: str = ""
     serpapi_api_key: str = ""
     fred_api_key: str = ""
+    max_concurrent_requests: int = 8
+    retrieval_cache_disabled: bool = False
 
     # App
     database_path: str = "data/thefindbrief.db"
@@ -34,8 +46,31 @@ class Settings(BaseSettings):
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
-    def get_partner_accounts(self) -> dict[str, dict[str, str]]:
-        """Return a dict mapping username -> {password, display_name}."""
+    @field_validator("retrieval_cache_disabled", mode="before")
+    @classmethod
+    def _blank_means_false(cls, value: object) -> object:
+        """Treat a blank env value as False.
+
+        Every key in .env.example ships blank, so a copied-over file
+        must not fail bool parsing on this one.
+        """
+        if value == "":
+            return False
+        return value
+
+    @cached_property
+    def partner_accounts(self) -> dict[str, dict[str, str]]:
+        """Dict mapping username -> {password, display_name}, built once.
+
+        Settings are static after startup, so the dict is assembled a
+        single time instead of on every login attempt. PARTNERS_JSON
+        takes precedence over the individual PARTNER_N_* fields.
+        """
+        if self.partners_json:
+            try:
+                return json.loads(self.partners_json)
+            except json.JSONDecodeError:
+                _logger.error("PARTNERS_JSON is not valid JSON — falling back to PARTNER_N_* fields")
         return {
             self.partner_1_username: {
                 "password": self.partner_1_password,
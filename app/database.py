@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import aiosqlite
 
@@ -9,25 +12,109 @@ logger = logging.getLogger(__name__)
 
 _db_path: str = settings.database_path
 
+# Ensure the data directory exists once at import; the isdir fast path
+# skips the makedirs syscall on every startup after the first.
+_db_dir = os.path.dirname(_db_path) or "."
+if not os.path.isdir(_db_dir):
+    os.makedirs(_db_dir, exist_ok=True)
 
-async def get_db() -> aiosqlite.Connection:
-    """Open a connection to the SQLite database."""
+_READ_POOL_SIZE = 4
+
+_read_pool: asyncio.Queue[aiosqlite.Connection] | None = None
+_write_conn: aiosqlite.Connection | None = None
+_write_lock = asyncio.Lock()
+_connect_lock = asyncio.Lock()
+
+
+async def _open_connection(*, read_only: bool = False) -> aiosqlite.Connection:
+    """Open a single connection with per-connection PRAGMAs applied.
+
+    Reader connections are marked query_only so an accidental write
+    through the read pool fails loudly instead of contending with the
+    single writer.
+    """
     db = await aiosqlite.connect(_db_path)
     db.row_factory = aiosqlite.Row
     await db.execute("PRAGMA journal_mode=WAL")
+    await db.execute("PRAGMA synchronous=NORMAL")
+    await db.execute("PRAGMA busy_timeout=30000")
+    await db.execute("PRAGMA cache_size=-64000")
+    await db.execute("PRAGMA temp_store=MEMORY")
+    await db.execute("PRAGMA mmap_size=268435456")
     await db.execute("PRAGMA foreign_keys=ON")
+    if read_only:
+        await db.execute("PRAGMA query_only=ON")
     return db
 
 
-async def init_db() -> None:
-    """Create all tables if they don't exist. Called on app startup."""
-    os.makedirs(os.path.dirname(_db_path) or ".", exist_ok=True)
+async def connect_db() -> None:
+    """Open the long-lived connection pool. Called on app startup.
+
+    Holds one write connection (serialized behind an asyncio.Lock) and
+    a small queue of read connections, all reused for the app lifetime.
+    """
+    global _read_pool, _write_conn
+    async with _connect_lock:
+        if _write_conn is not None:
+            return
+        _write_conn = await _open_connection()
+        pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue(maxsize=_READ_POOL_SIZE)
+        for _ in range(_READ_POOL_SIZE):
+            pool.put_nowait(await _open_connection(read_only=True))
+        _read_pool = pool
+    logger.info(
+        "Database pool ready at %s (%d readers + 1 writer)",
+        _db_path, _READ_POOL_SIZE,
+    )
+
+
+async def close_db() -> None:
+    """Close all pooled connections. Called on app shutdown."""
+    global _read_pool, _write_conn
+    if _write_conn is not None:
+        await _write_conn.close()
+        _write_conn = None
+    if _read_pool is not None:
+        while not _read_pool.empty():
+            await _read_pool.get_nowait().close()
+        _read_pool = None
 
-    db = await get_db()
+
+@asynccontextmanager
+async def get_db() -> AsyncIterator[aiosqlite.Connection]:
+    """Acquire a read connection from the pool for the duration of the block."""
+    if _read_pool is None:
+        await connect_db()
+    assert _read_pool is not None
+    db = await _read_pool.get()
     try:
-        await db.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS editions (
+        yield db
+    finally:
+        _read_pool.put_nowait(db)
+
+
+@asynccontextmanager
+async def get_write_db() -> AsyncIterator[aiosqlite.Connection]:
+    """Acquire the single write connection, serialized behind the write lock.
+
+    If the block raises mid-transaction, the transaction is rolled back
+    before the connection returns to the pool — otherwise the next
+    writer would silently commit the partial work.
+    """
+    if _write_conn is None:
+        await connect_db()
+    assert _write_conn is not None
+    async with _write_lock:
+        try:
+            yield _write_conn
+        except BaseException:
+            if _write_conn is not None and _write_conn.in_transaction:
+                await _write_conn.rollback()
+            raise
+
+
+_SCHEMA_DDL: tuple[str, ...] = (
+    """CREATE TABLE IF NOT EXISTS editions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 status TEXT DEFAULT 'draft',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -37,9 +124,8 @@ async def init_db() -> None:
                 pipeline_progress INTEGER DEFAULT 0,
                 generation_mode TEXT DEFAULT 'auto',
                 editorial_brief TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS articles (
+            )""",
+    """CREATE TABLE IF NOT EXISTS articles (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 edition_id INTEGER NOT NULL,
                 title TEXT NOT NULL,
@@ -52,21 +138,21 @@ async def init_db() -> None:
                 is_duplicate BOOLEAN DEFAULT 0,
                 raw_snippet TEXT,
                 retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                retrieved_at_epoch INTEGER,
                 FOREIGN KEY (edition_id) REFERENCES editions(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS section_drafts (
+            )""",
+    """CREATE TABLE IF NOT EXISTS section_drafts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 edition_id INTEGER NOT NULL,
                 section_name TEXT NOT NULL,
                 content TEXT,
                 word_count INTEGER,
                 model_used TEXT,
+                annotated_content TEXT,
                 generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (edition_id) REFERENCES editions(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS compliance_flags (
+            )""",
+    """CREATE TABLE IF NOT EXISTS compliance_flags (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 section_draft_id INTEGER NOT NULL,
                 severity TEXT NOT NULL,
@@ -81,9 +167,8 @@ async def init_db() -> None:
                 resolution_note TEXT,
                 pass_number INTEGER,
                 FOREIGN KEY (section_draft_id) REFERENCES section_drafts(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS audit_log (
+            )""",
+    """CREATE TABLE IF NOT EXISTS audit_log (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 edition_id INTEGER,
                 actor TEXT NOT NULL,
@@ -91,24 +176,81 @@ async def init_db() -> None:
                 details TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (edition_id) REFERENCES editions(id)
-            );
-            """
-        )
+            )""",
+    """CREATE TABLE IF NOT EXISTS retrieval_cache (
+                cache_key TEXT PRIMARY KEY,
+                articles TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )""",
+    """CREATE INDEX IF NOT EXISTS idx_articles_edition
+                ON articles(edition_id)""",
+    """CREATE INDEX IF NOT EXISTS idx_section_drafts_edition
+                ON section_drafts(edition_id)""",
+    """CREATE INDEX IF NOT EXISTS idx_flags_section_resolved
+                ON compliance_flags(section_draft_id, is_resolved, severity)""",
+    """CREATE INDEX IF NOT EXISTS idx_audit_edition
+                ON audit_log(edition_id, created_at DESC)""",
+    """CREATE INDEX IF NOT EXISTS idx_editions_status
+                ON editions(status, created_at DESC)""",
+)
+
+
+# Bump whenever _SCHEMA_DDL changes; init_db() skips straight past an
+# already-migrated database with a single PRAGMA read.
+_SCHEMA_VERSION = 6
+
+
+async def init_db() -> None:
+    """Create or migrate the schema. Called on app startup.
+
+    Tracks PRAGMA user_version so startup on an initialized database is
+    one PRAGMA read instead of re-parsing the full DDL script.
+    """
+    async with get_write_db() as db:
+        cursor = await db.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        if row and row[0] >= _SCHEMA_VERSION:
+            logger.info("Database schema current (version %d)", row[0])
+            return
+
+        # One explicit transaction for the whole DDL script: executescript
+        # would commit per call, so each statement runs individually here.
+        await db.execute("BEGIN IMMEDIATE")
+        for statement in _SCHEMA_DDL:
+            await db.execute(statement)
+
+        # Migrate existing DBs — add only genuinely missing columns
+        migrations: dict[str, list[tuple[str, str]]] = {
+            "editions": [
+                ("generation_mode", "TEXT DEFAULT 'auto'"),
+                ("editorial_brief", "TEXT"),
+            ],
+            "section_drafts": [
+                ("annotated_content", "TEXT"),
+            ],
+            "articles": [
+                ("retrieved_at_epoch", "INTEGER"),
+            ],
+        }
+        for table, columns in migrations.items():
+            cursor = await db.execute(f"PRAGMA table_info({table})")
+            existing_columns = {r[1] for r in await cursor.fetchall()}
+            for col, definition in columns:
+                if col not in existing_columns:
+                    await db.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {col} {definition}"
+                    )
+
+        # Superseded by idx_flags_section_resolved (adds severity)
+        await db.execute("DROP INDEX IF EXISTS idx_flags_section")
+
+        await db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         await db.commit()
 
-        # Migrate existing DBs — add columns that may not exist yet
-        for col, definition in [
-            ("generation_mode", "TEXT DEFAULT 'auto'"),
-            ("editorial_brief", "TEXT"),
-        ]:
-            try:
-                await db.execute(
-                    f"ALTER TABLE editions ADD COLUMN {col} {definition}"
-                )
-            except Exception:
-                pass  # Column already exists
+        await db.execute("ANALYZE")
         await db.commit()
 
-        logger.info("Database initialized at %s", _db_path)
-    finally:
-        await db.close()
+        logger.info(
+            "Database initialized at %s (schema version %d)",
+            _db_path, _SCHEMA_VERSION,
+        )
@@ -1,19 +1,27 @@
 import asyncio
-import html as html_lib
-import json
+import functools
+import hashlib
 import logging
-import re
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+import orjson
 from fastapi import Depends, FastAPI, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from app.auth import AuthRequired, authenticate, create_session, get_current_user
-from app.database import get_db, init_db
+from app.annotations import annotate_content
+from app.auth import (
+    AuthRequired,
+    authenticate,
+    create_session,
+    get_current_user,
+    invalidate_session,
+)
+from app.database import close_db, connect_db, get_db, get_write_db, init_db
 from app.pipeline.orchestrator import run_pipeline
+from app.pipeline.verification import close_link_client
 from app.pipeline.prompts import DISCLAIMER_TEXTS, SECTION_DISPLAY_NAMES
 
 logging.basicConfig(level=logging.INFO)
@@ -24,9 +32,12 @@ _BASE_DIR = Path(__file__).resolve().parent
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await connect_db()
     await init_db()
     logger.info("The Find Brief started")
     yield
+    await close_link_client()
+    await close_db()
 
 
 app = FastAPI(title="The Find Brief", lifespan=lifespan)
@@ -34,6 +45,83 @@ app = FastAPI(title="The Find Brief", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory=_BASE_DIR / "static"), name="static")
 
 templates = Jinja2Templates(directory=_BASE_DIR / "templates")
+# Templates never change at runtime in this deployment — skip the
+# per-render mtime stat and keep compiled templates cached.
+templates.env.auto_reload = False
+
+# Hot partials rendered on every flag resolve / approve round-trip,
+# looked up once instead of per request.
+_FLAG_CARD_TMPL = templates.get_template("partials/flag_card.html")
+_APPROVE_BTN_TMPL = templates.get_template("partials/approve_button.html")
+
+
+# ---- SQL statements (module-level so SQLite's statement cache hits) ----
+
+_SQL_EDITIONS_LIST = (
+    "SELECT id, status, created_at, approved_by, approved_at, generation_mode, "
+    "editorial_brief FROM editions ORDER BY created_at DESC"
+)
+_SQL_CREATE_EDITION = (
+    "INSERT INTO editions (status, pipeline_stage, pipeline_progress, generation_mode, editorial_brief) "
+    "SELECT 'generating', 'starting', 0, ?, ? "
+    "WHERE NOT EXISTS (SELECT 1 FROM editions WHERE status = 'generating') "
+    "RETURNING id"
+)
+_SQL_AUDIT_PIPELINE_STARTED = (
+    "INSERT INTO audit_log (edition_id, actor, action) VALUES (?, ?, 'pipeline_started')"
+)
+_SQL_PIPELINE_STATUS = (
+    "SELECT e.status, e.pipeline_stage, e.pipeline_progress, "
+    "(SELECT COUNT(*) FROM articles WHERE edition_id = e.id) AS cnt "
+    "FROM editions e WHERE e.id = ?"
+)
+_SQL_EDITION_HEADER = (
+    "SELECT id, status, created_at, approved_by FROM editions WHERE id = ?"
+)
+_SQL_EDITION_HEADER_WITH_APPROVAL = (
+    "SELECT id, status, created_at, approved_by, approved_at FROM editions WHERE id = ?"
+)
+_SQL_ARTICLES_FOR_EDITION = (
+    "SELECT * FROM articles WHERE edition_id = ? ORDER BY source, quality_score DESC"
+)
+_SQL_ARTICLE_CATEGORIES = (
+    "SELECT DISTINCT relevance_category FROM articles "
+    "WHERE edition_id = ? AND is_duplicate = 0 AND relevance_category IS NOT NULL"
+)
+_SQL_RESOLVE_FLAG = (
+    "UPDATE compliance_flags SET is_resolved = 1, resolved_by = ?, "
+    "resolved_at = CURRENT_TIMESTAMP, resolution_note = ? WHERE id = ?"
+)
+_SQL_FLAG_BY_ID = (
+    "SELECT id, section_draft_id, severity, flag_type, matched_text, "
+    "rule_reference, explanation, recommended_action, is_resolved, "
+    "resolved_by, resolved_at, resolution_note, pass_number "
+    "FROM compliance_flags WHERE id = ?"
+)
+_SQL_EDITION_FOR_FLAG = (
+    "SELECT sd.edition_id FROM section_drafts sd "
+    "JOIN compliance_flags cf ON cf.section_draft_id = sd.id "
+    "WHERE cf.id = ?"
+)
+_SQL_AUDIT_FLAG_RESOLVED = (
+    "INSERT INTO audit_log (edition_id, actor, action, details) "
+    "VALUES (?, ?, 'flag_resolved', ?)"
+)
+_SQL_BLOCKING_COUNT = (
+    "SELECT COUNT(*) as cnt FROM compliance_flags cf "
+    "JOIN section_drafts sd ON cf.section_draft_id = sd.id "
+    "WHERE sd.edition_id = ? AND cf.is_resolved = 0 "
+    "AND cf.severity IN ('BLOCK', 'MANDATORY_REVIEW')"
+)
+_SQL_EDITION_STATUS = "SELECT status, approved_by FROM editions WHERE id = ?"
+_SQL_APPROVE_EDITION = (
+    "UPDATE editions SET status = 'approved', approved_by = ?, "
+    "approved_at = CURRENT_TIMESTAMP WHERE id = ?"
+)
+_SQL_AUDIT_EDITION_APPROVED = (
+    "INSERT INTO audit_log (edition_id, actor, action) "
+    "VALUES (?, ?, 'edition_approved')"
+)
 
 
 @app.exception_handler(AuthRequired)
@@ -70,7 +158,10 @@ async def login_submit(request: Request, username: str = Form(), password: str =
 
 
 @app.get("/logout")
-async def logout():
+async def logout(request: Request):
+    cookie = request.cookies.get("session")
+    if cookie:
+        invalidate_session(cookie)
     response = RedirectResponse("/login", status_code=303)
     response.delete_cookie("session")
     return response
@@ -78,14 +169,9 @@ async def logout():
 
 @app.get("/")
 async def dashboard(request: Request, user: dict = Depends(get_current_user)):
-    db = await get_db()
-    try:
-        cursor = await db.execute(
-            "SELECT id, status, created_at, approved_by, approved_at, generation_mode, editorial_brief FROM editions ORDER BY created_at DESC"
-        )
+    async with get_db() as db:
+        cursor = await db.execute(_SQL_EDITIONS_LIST)
         editions = await cursor.fetchall()
-    finally:
-        await db.close()
     return templates.TemplateResponse(
         request, "dashboard.html", {"user": user, "editions": editions}
     )
@@ -107,37 +193,24 @@ async def pipeline_run(
         editorial_brief = None
         mode = "auto"
 
-    db = await get_db()
-    try:
-        # Concurrent pipeline guard
-        cursor = await db.execute(
-            "SELECT id FROM editions WHERE status = 'generating' LIMIT 1"
-        )
-        running = await cursor.fetchone()
-        if running:
+    async with get_write_db() as db:
+        # Guarded insert: the NOT EXISTS check and the INSERT run as one
+        # statement, so there is no window for two concurrent requests to
+        # both pass a separate guard SELECT. No row back = guard tripped.
+        cursor = await db.execute(_SQL_CREATE_EDITION, (mode, editorial_brief))
+        row = await cursor.fetchone()
+        if row is None:
+            await db.rollback()
             return templates.TemplateResponse(
                 request,
                 "partials/pipeline_status.html",
                 {"error_message": "A pipeline is already running"},
             )
+        edition_id = row["id"]
 
-        # Create new edition
-        cursor = await db.execute(
-            "INSERT INTO editions (status, pipeline_stage, pipeline_progress, generation_mode, editorial_brief) "
-            "VALUES ('generating', 'starting', 0, ?, ?)",
-            (mode, editorial_brief),
-        )
+        # Log to audit — same transaction, one commit/fsync for both rows
+        await db.execute(_SQL_AUDIT_PIPELINE_STARTED, (edition_id, user["username"]))
         await db.commit()
-        edition_id = cursor.lastrowid
-
-        # Log to audit
-        await db.execute(
-            "INSERT INTO audit_log (edition_id, actor, action) VALUES (?, ?, 'pipeline_started')",
-            (edition_id, user["username"]),
-        )
-        await db.commit()
-    finally:
-        await db.close()
 
     # Fire off pipeline as background task
     asyncio.create_task(run_pipeline(edition_id, editorial_brief=editorial_brief))
@@ -159,22 +232,11 @@ async def pipeline_run(
 async def pipeline_status(
     request: Request, edition_id: int, user: dict = Depends(get_current_user)
 ):
-    db = await get_db()
-    try:
-        cursor = await db.execute(
-            "SELECT status, pipeline_stage, pipeline_progress FROM editions WHERE id = ?",
-            (edition_id,),
-        )
+    async with get_db() as db:
+        # One round-trip: the article count rides along as a subquery
+        cursor = await db.execute(_SQL_PIPELINE_STATUS, (edition_id,))
         edition = await cursor.fetchone()
-
-        cursor = await db.execute(
-            "SELECT COUNT(*) as cnt FROM articles WHERE edition_id = ?",
-            (edition_id,),
-        )
-        row = await cursor.fetchone()
-        article_count = row["cnt"] if row else 0
-    finally:
-        await db.close()
+    article_count = edition["cnt"] if edition else 0
 
     if not edition:
         return templates.TemplateResponse(
@@ -183,7 +245,14 @@ async def pipeline_status(
             {"error_message": "Edition not found"},
         )
 
-    return templates.TemplateResponse(
+    # Cheap content key over the observable state: when nothing changed
+    # since the client's last poll, skip the template render entirely.
+    state = f"{edition['status']}|{edition['pipeline_stage']}|{edition['pipeline_progress']}|{article_count}"
+    etag = '"' + hashlib.blake2b(state.encode(), digest_size=8).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    response = templates.TemplateResponse(
         request,
         "partials/pipeline_status.html",
         {
@@ -194,50 +263,53 @@ async def pipeline_status(
             "article_count": article_count,
         },
     )
+    response.headers["ETag"] = etag
+    # no-cache = store but always revalidate: guarantees the browser
+    # sends If-None-Match on the next poll so the 304 path actually runs
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.get("/sources/{edition_id}")
 async def sources_page(
     request: Request, edition_id: int, user: dict = Depends(get_current_user)
 ):
-    db = await get_db()
-    try:
-        cursor = await db.execute(
-            "SELECT id, status, created_at, approved_by FROM editions WHERE id = ?",
-            (edition_id,),
-        )
+    async with get_db() as db:
+        cursor = await db.execute(_SQL_EDITION_HEADER, (edition_id,))
         edition = await cursor.fetchone()
 
-        cursor = await db.execute(
-            "SELECT * FROM articles WHERE edition_id = ? ORDER BY source, quality_score DESC",
-            (edition_id,),
-        )
+        cursor = await db.execute(_SQL_ARTICLES_FOR_EDITION, (edition_id,))
         articles = await cursor.fetchall()
-    finally:
-        await db.close()
 
     if not edition:
         return RedirectResponse("/", status_code=303)
 
-    # Group articles by source
+    # Group by source and accumulate the stats bar in the same pass
     sources: dict[str, list] = {}
+    tier_counts = {1: 0, 2: 0, 3: 0}
+    paywalled = duplicates = 0
+    score_sum = 0.0
     for article in articles:
         src = article["source"]
         if src not in sources:
             sources[src] = []
         sources[src].append(article)
 
-    # Compute summary stats for the stats bar
+        tier_counts[article["source_tier"]] = tier_counts.get(article["source_tier"], 0) + 1
+        if article["is_paywalled"]:
+            paywalled += 1
+        if article["is_duplicate"]:
+            duplicates += 1
+        score_sum += article["quality_score"]
+
     stats = {
         "total": len(articles),
-        "tier_1": sum(1 for a in articles if a["source_tier"] == 1),
-        "tier_2": sum(1 for a in articles if a["source_tier"] == 2),
-        "tier_3": sum(1 for a in articles if a["source_tier"] == 3),
-        "paywalled": sum(1 for a in articles if a["is_paywalled"]),
-        "duplicates": sum(1 for a in articles if a["is_duplicate"]),
-        "avg_score": round(
-            sum(a["quality_score"] for a in articles) / len(articles), 2
-        ) if articles else 0.0,
+        "tier_1": tier_counts[1],
+        "tier_2": tier_counts[2],
+        "tier_3": tier_counts[3],
+        "paywalled": paywalled,
+        "duplicates": duplicates,
+        "avg_score": round(score_sum / len(articles), 2) if articles else 0.0,
     }
 
     return templates.TemplateResponse(
@@ -253,79 +325,15 @@ async def sources_page(
     )
 
 
-def _annotate_content(content: str, flags: list[dict]) -> str:
-    """HTML-escape content and insert compliance highlight spans.
+@functools.lru_cache(maxsize=256)
+def _compute_disclaimers(
+    flag_types: frozenset[str], article_categories: frozenset[str]
+) -> tuple[dict, ...]:
+    """Determine which disclaimers to include based on flags and article categories.
 
-    Escapes the full content first, then inserts trusted <span> tags
-    for each flag. Tracks annotated ranges to prevent overlapping highlights.
+    Inputs are frozensets drawn from a small closed vocabulary, so the
+    same combinations recur across page loads — results are memoized.
     """
-    escaped = html_lib.escape(content)
-
-    # Sort flags by matched_text length descending (longest first)
-    sorted_flags = sorted(flags, key=lambda f: len(f.get("matched_text", "")), reverse=True)
-
-    annotated_ranges: list[list[int]] = []
-
-    for flag in sorted_flags:
-        matched_text = flag.get("matched_text", "")
-        if not matched_text:
-            continue
-
-        # HTML-escape the matched text so it matches the escaped content
-        escaped_match = html_lib.escape(matched_text)
-        severity_class = flag["severity"].lower().replace("_", "-")
-        flag_id = flag["id"]
-
-        match = re.search(re.escape(escaped_match), escaped)
-        if not match:
-            continue
-
-        start, end = match.start(), match.end()
-
-        # Check for overlap with existing annotations
-        overlaps = False
-        for r in annotated_ranges:
-            if start < r[1] and end > r[0]:
-                overlaps = True
-                break
-
-        if overlaps:
-            logger.debug(
-                "Flag %d skipped inline highlight (overlaps existing annotation)",
-                flag_id,
-            )
-            continue
-
-        replacement = (
-            f'<span class="compliance-highlight compliance-highlight--{severity_class}" '
-            f'data-flag-id="{flag_id}">'
-            f'{escaped_match}'
-            f'<span class="compliance-indicator compliance-indicator--{severity_class}" '
-            f'data-flag-id="{flag_id}"></span>'
-            f'</span>'
-        )
-
-        # Replace this occurrence
-        escaped = escaped[:start] + replacement + escaped[end:]
-
-        # Track the annotated range (adjusted for inserted HTML)
-        new_end = start + len(replacement)
-        annotated_ranges.append([start, new_end])
-
-        # Shift all existing ranges that come after this insertion point
-        shift = len(replacement) - (end - start)
-        for r in annotated_ranges[:-1]:
-            if r[0] >= end:
-                r[0] += shift
-                r[1] += shift
-
-    return escaped
-
-
-def _compute_disclaimers(
-    flag_types: set[str], article_categories: set[str]
-) -> list[dict]:
-    """Determine which disclaimers to include based on flags and article categories."""
     disclaimers: list[dict] = [
         {"name": "GENERAL", "text": DISCLAIMER_TEXTS["GENERAL"]}
     ]
@@ -350,85 +358,138 @@ def _compute_disclaimers(
             {"name": "PRIVATE_PLACEMENT", "text": DISCLAIMER_TEXTS["PRIVATE_PLACEMENT"]}
         )
 
-    return disclaimers
+    return tuple(disclaimers)
+
+
+_SECTIONS_WITH_FLAGS_SQL = (
+    "SELECT sd.id AS sd_id, sd.section_name, sd.content, sd.word_count, "
+    "sd.model_used, sd.annotated_content, sd.generated_at, "
+    "cf.id AS flag_id, cf.severity, cf.flag_type, cf.matched_text, "
+    "cf.rule_reference, cf.explanation, cf.recommended_action, "
+    "cf.is_resolved, cf.resolved_by, cf.resolved_at, cf.resolution_note, "
+    "cf.pass_number "
+    "FROM section_drafts sd "
+    "LEFT JOIN compliance_flags cf ON cf.section_draft_id = sd.id "
+    "WHERE sd.edition_id = ? ORDER BY sd.id, cf.id"
+)
+
+
+async def _fetch_sections_with_flags(
+    db, edition_id: int
+) -> tuple[list[dict], dict[int, list[dict]]]:
+    """Fetch section drafts and their compliance flags in one round-trip.
+
+    Returns (sections_list, flags_by_section). The fixed JOIN replaces
+    the old section SELECT followed by a dynamically built IN (?,...) —
+    one prepared statement regardless of section count.
+    """
+    cursor = await db.execute(_SECTIONS_WITH_FLAGS_SQL, (edition_id,))
+    rows = await cursor.fetchall()
+
+    sections_list: list[dict] = []
+    flags_by_section: dict[int, list[dict]] = {}
+    for row in rows:
+        sid = row["sd_id"]
+        if sid not in flags_by_section:
+            flags_by_section[sid] = []
+            sections_list.append({
+                "id": sid,
+                "section_name": row["section_name"],
+                "content": row["content"],
+                "word_count": row["word_count"],
+                "model_used": row["model_used"],
+                "annotated_content": row["annotated_content"],
+                "generated_at": row["generated_at"],
+            })
+        if row["flag_id"] is not None:
+            flags_by_section[sid].append({
+                "id": row["flag_id"],
+                "section_draft_id": sid,
+                "severity": row["severity"],
+                "flag_type": row["flag_type"],
+                "matched_text": row["matched_text"],
+                "rule_reference": row["rule_reference"],
+                "explanation": row["explanation"],
+                "recommended_action": row["recommended_action"],
+                "is_resolved": row["is_resolved"],
+                "resolved_by": row["resolved_by"],
+                "resolved_at": row["resolved_at"],
+                "resolution_note": row["resolution_note"],
+                "pass_number": row["pass_number"],
+            })
+    return sections_list, flags_by_section
+
+
+_FLAG_AGG_SQL = (
+    "SELECT cf.severity, cf.flag_type, COUNT(*) AS cnt "
+    "FROM compliance_flags cf "
+    "JOIN section_drafts sd ON cf.section_draft_id = sd.id "
+    "WHERE sd.edition_id = ? AND cf.is_resolved = 0 "
+    "GROUP BY cf.severity, cf.flag_type"
+)
+
+
+async def _fetch_flag_aggregates(
+    db, edition_id: int
+) -> tuple[dict[str, int], int, set[str], int]:
+    """Aggregate unresolved flags in SQL instead of counting rows in Python.
+
+    Returns (flag_counts, total_flags, all_flag_types, blocking_count).
+    """
+    flag_counts: dict[str, int] = {
+        "BLOCK": 0, "MANDATORY_REVIEW": 0, "WARNING": 0, "ADD_DISCLAIMER": 0
+    }
+    total_flags = 0
+    all_flag_types: set[str] = set()
+    blocking_count = 0
+
+    cursor = await db.execute(_FLAG_AGG_SQL, (edition_id,))
+    for row in await cursor.fetchall():
+        cnt = row["cnt"]
+        flag_counts[row["severity"]] = flag_counts.get(row["severity"], 0) + cnt
+        total_flags += cnt
+        all_flag_types.add(row["flag_type"] or "")
+        if row["severity"] in ("BLOCK", "MANDATORY_REVIEW"):
+            blocking_count += cnt
+    return flag_counts, total_flags, all_flag_types, blocking_count
 
 
 @app.get("/draft/{edition_id}")
 async def draft_page(
     request: Request, edition_id: int, user: dict = Depends(get_current_user)
 ):
-    db = await get_db()
-    try:
-        cursor = await db.execute(
-            "SELECT id, status, created_at, approved_by FROM editions WHERE id = ?",
-            (edition_id,),
-        )
+    async with get_db() as db:
+        cursor = await db.execute(_SQL_EDITION_HEADER, (edition_id,))
         edition = await cursor.fetchone()
 
-        cursor = await db.execute(
-            "SELECT id, section_name, content, word_count, model_used, generated_at "
-            "FROM section_drafts WHERE edition_id = ? ORDER BY id",
-            (edition_id,),
+        sections_list, flags_by_section = await _fetch_sections_with_flags(
+            db, edition_id
+        )
+        flag_counts, total_flags, all_flag_types, _ = await _fetch_flag_aggregates(
+            db, edition_id
         )
-        sections = await cursor.fetchall()
-
-        # Fetch compliance flags for all sections in this edition
-        section_ids = [s["id"] for s in sections]
-        flags_by_section: dict[int, list[dict]] = {sid: [] for sid in section_ids}
-
-        if section_ids:
-            placeholders = ",".join("?" * len(section_ids))
-            cursor = await db.execute(
-                "SELECT id, section_draft_id, severity, flag_type, matched_text, "
-                "rule_reference, explanation, recommended_action, is_resolved, "
-                "pass_number FROM compliance_flags "
-                f"WHERE section_draft_id IN ({placeholders})",
-                section_ids,
-            )
-            all_flags = [dict(row) for row in await cursor.fetchall()]
-            for f in all_flags:
-                flags_by_section[f["section_draft_id"]].append(f)
 
         # Fetch article categories for disclaimer computation
-        cursor = await db.execute(
-            "SELECT DISTINCT relevance_category FROM articles "
-            "WHERE edition_id = ? AND is_duplicate = 0 AND relevance_category IS NOT NULL",
-            (edition_id,),
-        )
+        cursor = await db.execute(_SQL_ARTICLE_CATEGORIES, (edition_id,))
         article_categories = {row["relevance_category"] for row in await cursor.fetchall()}
-    finally:
-        await db.close()
 
     if not edition:
         return RedirectResponse("/", status_code=303)
 
-    # Convert Row objects to dicts and attach compliance data
-    sections_list = [dict(s) for s in sections]
-    all_flag_types: set[str] = set()
-    flag_counts: dict[str, int] = {
-        "BLOCK": 0, "MANDATORY_REVIEW": 0, "WARNING": 0, "ADD_DISCLAIMER": 0
-    }
-    total_flags = 0
-
     for section in sections_list:
         section_flags = flags_by_section.get(section["id"], [])
         section["flags"] = section_flags
 
-        if section_flags and section["content"]:
-            section["annotated_content"] = _annotate_content(
-                section["content"], section_flags
+        # Prefer the HTML cached at pipeline time; annotate on the fly
+        # only for editions predating the cache column — off the event
+        # loop, so status polls aren't stalled by a long section
+        if section["annotated_content"] is None and section_flags and section["content"]:
+            section["annotated_content"] = await asyncio.to_thread(
+                annotate_content, section["content"], section_flags
             )
-        else:
-            section["annotated_content"] = None
-
-        for f in section_flags:
-            if not f.get("is_resolved"):
-                flag_counts[f["severity"]] = flag_counts.get(f["severity"], 0) + 1
-                total_flags += 1
-                all_flag_types.add(f.get("flag_type", ""))
 
     has_unresolved_blocks = flag_counts.get("BLOCK", 0) > 0
-    disclaimers = _compute_disclaimers(all_flag_types, article_categories)
+    disclaimers = _compute_disclaimers(frozenset(all_flag_types), frozenset(article_categories))
 
     return templates.TemplateResponse(
         request,
@@ -453,48 +514,20 @@ async def draft_page(
 async def review_page(
     request: Request, edition_id: int, user: dict = Depends(get_current_user)
 ):
-    db = await get_db()
-    try:
-        cursor = await db.execute(
-            "SELECT id, status, created_at, approved_by, approved_at FROM editions WHERE id = ?",
-            (edition_id,),
-        )
+    async with get_db() as db:
+        cursor = await db.execute(_SQL_EDITION_HEADER_WITH_APPROVAL, (edition_id,))
         edition = await cursor.fetchone()
 
-        cursor = await db.execute(
-            "SELECT id, section_name, content, word_count, model_used, generated_at "
-            "FROM section_drafts WHERE edition_id = ? ORDER BY id",
-            (edition_id,),
+        sections_list, flags_by_section = await _fetch_sections_with_flags(
+            db, edition_id
+        )
+        flag_counts, total_flags, all_flag_types, blocking_count = (
+            await _fetch_flag_aggregates(db, edition_id)
         )
-        sections = await cursor.fetchall()
-
-        # Fetch compliance flags for all sections
-        section_ids = [s["id"] for s in sections]
-        flags_by_section: dict[int, list[dict]] = {sid: [] for sid in section_ids}
-
-        if section_ids:
-            placeholders = ",".join("?" * len(section_ids))
-            cursor = await db.execute(
-                "SELECT id, section_draft_id, severity, flag_type, matched_text, "
-                "rule_reference, explanation, recommended_action, is_resolved, "
-                "resolved_by, resolved_at, resolution_note, pass_number "
-                "FROM compliance_flags "
-                f"WHERE section_draft_id IN ({placeholders})",
-                section_ids,
-            )
-            all_flags = [dict(row) for row in await cursor.fetchall()]
-            for f in all_flags:
-                flags_by_section[f["section_draft_id"]].append(f)
 
         # Fetch article categories for disclaimer computation
-        cursor = await db.execute(
-            "SELECT DISTINCT relevance_category FROM articles "
-            "WHERE edition_id = ? AND is_duplicate = 0 AND relevance_category IS NOT NULL",
-            (edition_id,),
-        )
+        cursor = await db.execute(_SQL_ARTICLE_CATEGORIES, (edition_id,))
         article_categories = {row["relevance_category"] for row in await cursor.fetchall()}
-    finally:
-        await db.close()
 
     if not edition:
         return RedirectResponse("/", status_code=303)
@@ -502,39 +535,23 @@ async def review_page(
     if edition["status"] == "generating":
         return RedirectResponse(f"/draft/{edition_id}", status_code=303)
 
-    # Convert Row objects to dicts and attach compliance data
-    sections_list = [dict(s) for s in sections]
-    all_flag_types: set[str] = set()
-    flag_counts: dict[str, int] = {
-        "BLOCK": 0, "MANDATORY_REVIEW": 0, "WARNING": 0, "ADD_DISCLAIMER": 0
-    }
-    total_flags = 0
-    blocking_count = 0
-
     for section in sections_list:
         section_flags = flags_by_section.get(section["id"], [])
         section["flags"] = section_flags
 
-        if section_flags and section["content"]:
-            section["annotated_content"] = _annotate_content(
-                section["content"], section_flags
+        # Prefer the HTML cached at pipeline time; annotate on the fly
+        # only for editions predating the cache column — off the event
+        # loop, so status polls aren't stalled by a long section
+        if section["annotated_content"] is None and section_flags and section["content"]:
+            section["annotated_content"] = await asyncio.to_thread(
+                annotate_content, section["content"], section_flags
             )
-        else:
-            section["annotated_content"] = None
-
-        for f in section_flags:
-            if not f.get("is_resolved"):
-                flag_counts[f["severity"]] = flag_counts.get(f["severity"], 0) + 1
-                total_flags += 1
-                all_flag_types.add(f.get("flag_type", ""))
-                if f["severity"] in ("BLOCK", "MANDATORY_REVIEW"):
-                    blocking_count += 1
 
     can_approve = (
         blocking_count == 0
         and edition["status"] == "reviewing"
     )
-    disclaimers = _compute_disclaimers(all_flag_types, article_categories)
+    disclaimers = _compute_disclaimers(frozenset(all_flag_types), frozenset(article_categories))
 
     return templates.TemplateResponse(
         request,
@@ -563,86 +580,58 @@ async def resolve_flag(
     user: dict = Depends(get_current_user),
     resolution_note: str = Form(default=""),
 ):
-    db = await get_db()
-    try:
+    async with get_write_db() as db:
         # Update the flag
-        await db.execute(
-            "UPDATE compliance_flags SET is_resolved = 1, resolved_by = ?, "
-            "resolved_at = CURRENT_TIMESTAMP, resolution_note = ? WHERE id = ?",
-            (user["username"], resolution_note, flag_id),
-        )
-        await db.commit()
+        await db.execute(_SQL_RESOLVE_FLAG, (user["username"], resolution_note, flag_id))
 
         # Fetch the updated flag
-        cursor = await db.execute(
-            "SELECT id, section_draft_id, severity, flag_type, matched_text, "
-            "rule_reference, explanation, recommended_action, is_resolved, "
-            "resolved_by, resolved_at, resolution_note, pass_number "
-            "FROM compliance_flags WHERE id = ?",
-            (flag_id,),
-        )
+        cursor = await db.execute(_SQL_FLAG_BY_ID, (flag_id,))
         flag_row = await cursor.fetchone()
 
         if not flag_row:
+            await db.rollback()
             return HTMLResponse("<p>Flag not found</p>", status_code=404)
 
         flag_dict = dict(flag_row)
 
         # Find the edition_id via section_drafts
-        cursor = await db.execute(
-            "SELECT sd.edition_id FROM section_drafts sd "
-            "JOIN compliance_flags cf ON cf.section_draft_id = sd.id "
-            "WHERE cf.id = ?",
-            (flag_id,),
-        )
+        cursor = await db.execute(_SQL_EDITION_FOR_FLAG, (flag_id,))
         edition_row = await cursor.fetchone()
         if not edition_row:
+            await db.rollback()
             return HTMLResponse("<p>Edition not found</p>", status_code=404)
         edition_id = edition_row["edition_id"]
 
         # Audit log
         await db.execute(
-            "INSERT INTO audit_log (edition_id, actor, action, details) "
-            "VALUES (?, ?, 'flag_resolved', ?)",
+            _SQL_AUDIT_FLAG_RESOLVED,
             (
                 edition_id,
                 user["username"],
-                json.dumps({
+                orjson.dumps({
                     "flag_id": flag_id,
                     "severity": flag_dict["severity"],
                     "flag_type": flag_dict["flag_type"],
-                }),
+                }).decode(),
             ),
         )
+        # Flag update + audit row land in one transaction
         await db.commit()
 
         # Recompute blocking count for approve button
-        cursor = await db.execute(
-            "SELECT COUNT(*) as cnt FROM compliance_flags cf "
-            "JOIN section_drafts sd ON cf.section_draft_id = sd.id "
-            "WHERE sd.edition_id = ? AND cf.is_resolved = 0 "
-            "AND cf.severity IN ('BLOCK', 'MANDATORY_REVIEW')",
-            (edition_id,),
-        )
+        cursor = await db.execute(_SQL_BLOCKING_COUNT, (edition_id,))
         row = await cursor.fetchone()
         blocking_count = row["cnt"] if row else 0
 
         # Fetch edition status
-        cursor = await db.execute(
-            "SELECT status, approved_by FROM editions WHERE id = ?",
-            (edition_id,),
-        )
+        cursor = await db.execute(_SQL_EDITION_STATUS, (edition_id,))
         edition = await cursor.fetchone()
-    finally:
-        await db.close()
 
     can_approve = blocking_count == 0 and edition["status"] == "reviewing"
 
     # Render flag card + OOB approve button
-    flag_html = templates.get_template("partials/flag_card.html").render(
-        flag=flag_dict
-    )
-    approve_html = templates.get_template("partials/approve_button.html").render(
+    flag_html = _FLAG_CARD_TMPL.render(flag=flag_dict)
+    approve_html = _APPROVE_BTN_TMPL.render(
         can_approve=can_approve,
         edition_id=edition_id,
         blocking_count=blocking_count,
@@ -662,23 +651,14 @@ async def approve_edition(
     edition_id: int,
     user: dict = Depends(get_current_user),
 ):
-    db = await get_db()
-    try:
+    async with get_write_db() as db:
         # Server-side guard: recheck blocking flags
-        cursor = await db.execute(
-            "SELECT COUNT(*) as cnt FROM compliance_flags cf "
-            "JOIN section_drafts sd ON cf.section_draft_id = sd.id "
-            "WHERE sd.edition_id = ? AND cf.is_resolved = 0 "
-            "AND cf.severity IN ('BLOCK', 'MANDATORY_REVIEW')",
-            (edition_id,),
-        )
+        cursor = await db.execute(_SQL_BLOCKING_COUNT, (edition_id,))
         row = await cursor.fetchone()
         blocking_count = row["cnt"] if row else 0
 
         if blocking_count > 0:
-            approve_html = templates.get_template(
-                "partials/approve_button.html"
-            ).render(
+            approve_html = _APPROVE_BTN_TMPL.render(
                 can_approve=False,
                 edition_id=edition_id,
                 blocking_count=blocking_count,
@@ -688,25 +668,14 @@ async def approve_edition(
             return HTMLResponse(approve_html)
 
         # Approve the edition
-        await db.execute(
-            "UPDATE editions SET status = 'approved', approved_by = ?, "
-            "approved_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (user["username"], edition_id),
-        )
-        await db.commit()
+        await db.execute(_SQL_APPROVE_EDITION, (user["username"], edition_id))
 
-        # Audit log
-        await db.execute(
-            "INSERT INTO audit_log (edition_id, actor, action) "
-            "VALUES (?, ?, 'edition_approved')",
-            (edition_id, user["username"]),
-        )
+        # Audit log — same transaction, one commit/fsync
+        await db.execute(_SQL_AUDIT_EDITION_APPROVED, (edition_id, user["username"]))
         await db.commit()
-    finally:
-        await db.close()
 
     response = HTMLResponse(
-        templates.get_template("partials/approve_button.html").render(
+        _APPROVE_BTN_TMPL.render(
             can_approve=False,
             edition_id=edition_id,
             blocking_count=0,
@@ -1,18 +1,23 @@
 import asyncio
-import json
+import bisect
+import functools
 import logging
 import re
 import time
 from pathlib import Path
+from typing import NamedTuple
 
 import google.generativeai as genai
+import orjson
 
+from app.annotations import annotate_content
 from app.config import settings
-from app.database import get_db
-from app.pipeline.gemini_utils import call_with_retry
+from app.database import get_db, get_write_db
+from app.pipeline.gemini_utils import call_with_retry, get_model
 from app.pipeline.prompts import (
     COMPLIANCE_SYSTEM_PROMPT,
     COMPLIANCE_USER_TEMPLATE,
+    LLM_EXCLUDED_SECTIONS,
 )
 
 logger = logging.getLogger(__name__)
@@ -26,12 +31,24 @@ logger = logging.getLogger(__name__)
 
 _VALID_SEVERITIES = {"BLOCK", "MANDATORY_REVIEW", "WARNING", "ADD_DISCLAIMER"}
 
-REGEX_PATTERNS: list[dict] = [
+
+class Rule(NamedTuple):
+    """One Pass-1 rule: raw pattern source plus flag metadata."""
+
+    name: str
+    pattern: str
+    severity: str
+    rule_reference: str
+    explanation: str
+    recommended_action: str
+
+
+REGEX_PATTERNS: tuple[Rule, ...] = tuple(Rule(**r) for r in [
     {
         "name": "guarantee_language",
-        "pattern": re.compile(
-            r"\b(guaranteed|risk[- ]free(?!\s+(?:rate|returns?|yield|benchmark))|no\s+risk|certain\s+to|cannot\s+lose)\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:guaranteed|risk[- ]free(?!\s+(?:rate|returns?|yield|benchmark))"
+            r"|no\s+risk|certain\s+to|cannot\s+lose)\b"
         ),
         "severity": "BLOCK",
         "rule_reference": "2210(d)(1)(B)",
@@ -40,9 +57,9 @@ REGEX_PATTERNS: list[dict] = [
     },
     {
         "name": "mnpi_risk",
-        "pattern": re.compile(
-            r"\b(insider\s+information|confidential\s+information|non[- ]public\s+information|before\s+announcement)\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:insider\s+information|confidential\s+information"
+            r"|non[- ]public\s+information|before\s+announcement)\b"
         ),
         "severity": "BLOCK",
         "rule_reference": "2210(d)(1)(B)",
@@ -51,9 +68,9 @@ REGEX_PATTERNS: list[dict] = [
     },
     {
         "name": "superlative_claim",
-        "pattern": re.compile(
-            r"\b(best\s+fund|top\s+manager|leading\s+performer|#1\s+fund|number\s+one\s+fund)\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:best\s+fund|top\s+manager|leading\s+performer"
+            r"|#1\s+fund|number\s+one\s+fund)\b"
         ),
         "severity": "BLOCK",
         "rule_reference": "2210(d)(1)(B)",
@@ -62,9 +79,10 @@ REGEX_PATTERNS: list[dict] = [
     },
     {
         "name": "performance_claim",
-        "pattern": re.compile(
-            r"\b(\d+\s*%\s*(return|yield|IRR|annualized|net|gross)|(IRR|yield|return)\s+of\s+\d+|outperform(ed|s|ing)?|beat(s|ing)?\s+(the\s+)?benchmark)\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:\d+\s*%\s*(?:return|yield|IRR|annualized|net|gross)"
+            r"|(?:IRR|yield|return)\s+of\s+\d+|outperform(?:ed|s|ing)?"
+            r"|beat(?:s|ing)?\s+(?:the\s+)?benchmark)\b"
         ),
         "severity": "MANDATORY_REVIEW",
         "rule_reference": "2210(d)(1)(F)",
@@ -73,9 +91,9 @@ REGEX_PATTERNS: list[dict] = [
     },
     {
         "name": "solicitation",
-        "pattern": re.compile(
-            r"\b(contact\s+us\s+to\s+invest|invest\s+with\s+us|schedule\s+a\s+call|get\s+in\s+touch\s+to\s+(invest|learn|discuss))\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:contact\s+us\s+to\s+invest|invest\s+with\s+us|schedule\s+a\s+call"
+            r"|get\s+in\s+touch\s+to\s+(?:invest|learn|discuss))\b"
         ),
         "severity": "WARNING",
         "rule_reference": "2210(d)(1)(A), Reg D 506(b)",
@@ -84,9 +102,9 @@ REGEX_PATTERNS: list[dict] = [
     },
     {
         "name": "tax_claim",
-        "pattern": re.compile(
-            r"\b(tax[- ]free\s+investment|no\s+tax\s+implications|tax\s+exempt\s+investment|avoid(s|ing)?\s+(all\s+)?tax(es|ation)?)\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:tax[- ]free\s+investment|no\s+tax\s+implications"
+            r"|tax\s+exempt\s+investment|avoid(?:s|ing)?\s+(?:all\s+)?tax(?:es|ation)?)\b"
         ),
         "severity": "WARNING",
         "rule_reference": "2210(d)(4)",
@@ -95,16 +113,37 @@ REGEX_PATTERNS: list[dict] = [
     },
     {
         "name": "forward_looking",
-        "pattern": re.compile(
-            r"\b(we\s+expect|we\s+forecast|we\s+anticipate|will\s+likely|projected\s+to|poised\s+to)\b",
-            re.IGNORECASE,
+        "pattern": (
+            r"\b(?:we\s+expect|we\s+forecast|we\s+anticipate"
+            r"|will\s+likely|projected\s+to|poised\s+to)\b"
         ),
         "severity": "ADD_DISCLAIMER",
         "rule_reference": "2210(d)(1)(F)",
         "explanation": "Forward-looking statements should be identified as such and accompanied by appropriate disclaimers.",
         "recommended_action": "Add forward-looking statement disclaimer. Consider qualifying with 'based on current expectations' or similar.",
     },
-]
+])
+
+# All patterns fused into one alternation of named groups: Pass 1 makes a
+# single scan over each section and match.lastgroup names the rule that
+# fired. Sub-patterns use only non-capturing groups so lastgroup stays
+# reliable.
+_COMBINED_PATTERN = re.compile(
+    "|".join(f"(?P<{rule.name}>{rule.pattern})" for rule in REGEX_PATTERNS),
+    re.IGNORECASE,
+)
+_RULES_BY_NAME = {rule.name: rule for rule in REGEX_PATTERNS}
+
+# Opening markdown fence (with optional language tag) on Pass-2 output
+_FENCE_OPEN_RE = re.compile(r"^```\w*\n?")
+
+
+def _strip_json_fences(s: str) -> str:
+    """Strip surrounding markdown fences from a JSON payload in one pass."""
+    s = s.strip()
+    if s.startswith("```"):
+        s = _FENCE_OPEN_RE.sub("", s)
+    return s.removesuffix("```").strip()
 
 
 # ============================= PUBLIC API ==================================
@@ -116,15 +155,12 @@ async def run_compliance(edition_id: int) -> None:
     Pass 1: Regex pattern matching (mechanical checks).
     Pass 2: Gemini holistic review against the full regulatory framework.
     """
-    db = await get_db()
-    try:
+    async with get_db() as db:
         cursor = await db.execute(
             "SELECT id, section_name, content FROM section_drafts WHERE edition_id = ?",
             (edition_id,),
         )
         drafts = [dict(row) for row in await cursor.fetchall()]
-    finally:
-        await db.close()
 
     if not drafts:
         logger.warning("Edition %d: no section drafts to scan", edition_id)
@@ -139,20 +175,21 @@ async def run_compliance(edition_id: int) -> None:
     pass_1_total = 0
     pass_2_total = 0
 
+    # Filter out LLM-excluded sections once for both passes
+    scan_drafts = [
+        d for d in drafts if d["section_name"] not in LLM_EXCLUDED_SECTIONS
+    ]
+
     # --- Pass 1: Regex ---
-    for draft in drafts:
-        if draft["section_name"] == "perspective":
-            continue
-        try:
-            flags = _run_pass_1(draft["id"], draft["content"])
-            if flags:
-                await _store_flags(flags)
-                pass_1_total += len(flags)
-        except Exception:
-            logger.exception(
-                "Edition %d [%s]: Pass 1 failed",
-                edition_id, draft["section_name"],
-            )
+    try:
+        pass_1_flags = _run_pass_1(scan_drafts)
+    except Exception:
+        logger.exception("Edition %d: Pass 1 failed", edition_id)
+        pass_1_flags = []
+    if pass_1_flags:
+        # One executemany + one commit for the whole pass
+        await _store_flags(pass_1_flags)
+        pass_1_total = len(pass_1_flags)
 
     logger.info(
         "Edition %d: Pass 1 complete — %d regex flags", edition_id, pass_1_total
@@ -162,46 +199,49 @@ async def run_compliance(edition_id: int) -> None:
     if not settings.gemini_api_key:
         logger.warning("Gemini API key not set — skipping compliance Pass 2")
     else:
-        genai.configure(api_key=settings.gemini_api_key)
-        framework_text = _load_compliance_framework()
-        filled_system_prompt = COMPLIANCE_SYSTEM_PROMPT.format(
-            compliance_framework=framework_text
+        # Native JSON mode — no markdown fences to strip
+        model = get_model(
+            "gemini-2.5-flash", _compliance_system_prompt(), 0.3, 8192,
+            response_mime_type="application/json",
         )
 
-        model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
-            system_instruction=filled_system_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=8192,
-            ),
-        )
+        # Sections scan concurrently under a bounded semaphore instead of
+        # serially with a fixed sleep; call_with_retry absorbs any 429s.
+        # Results stream to the DB as each section finishes rather than
+        # waiting for the slowest call.
+        sem = asyncio.Semaphore(settings.gemini_concurrency)
 
-        gemini_call_count = 0
-        for draft in drafts:
-            if draft["section_name"] == "perspective":
-                continue
-            if gemini_call_count > 0:
-                await asyncio.sleep(2)
-            try:
+        async def _scan_one(draft: dict) -> tuple[dict, list[dict]]:
+            async with sem:
                 flags = await _run_pass_2(
                     draft["id"], draft["section_name"], draft["content"], model
                 )
-                if flags:
-                    await _store_flags(flags)
-                    pass_2_total += len(flags)
-            except Exception:
-                logger.exception(
-                    "Edition %d [%s]: Pass 2 failed",
-                    edition_id, draft["section_name"],
+                return draft, flags
+
+        tasks = [asyncio.create_task(_scan_one(d)) for d in scan_drafts]
+        for completed in asyncio.as_completed(tasks):
+            try:
+                draft, flags = await completed
+            except Exception as exc:
+                logger.error(
+                    "Edition %d: Pass 2 section failed: %s", edition_id, exc
                 )
-            gemini_call_count += 1
+                continue
+            if flags:
+                await _store_flags(flags)
+                pass_2_total += len(flags)
 
         logger.info(
             "Edition %d: Pass 2 complete — %d Gemini flags",
             edition_id, pass_2_total,
         )
 
+    # Cache highlight HTML so draft/review renders skip the annotation work
+    try:
+        await _cache_annotations(drafts)
+    except Exception:
+        logger.exception("Edition %d: failed to cache annotated content", edition_id)
+
     elapsed = round(time.monotonic() - start_time, 1)
     logger.info(
         "Edition %d: compliance scan complete in %.1fs (pass_1=%d, pass_2=%d)",
@@ -212,21 +252,41 @@ async def run_compliance(edition_id: int) -> None:
 # ============================= HELPERS =====================================
 
 
-def _run_pass_1(section_draft_id: int, content: str) -> list[dict]:
-    """Run regex patterns against section content. Returns flag dicts."""
+def _run_pass_1(drafts: list[dict]) -> list[dict]:
+    """Run the combined regex over all drafts in one scan. Returns flag dicts.
+
+    Section contents are joined with NUL sentinels (which no rule can
+    match across) and each hit is attributed back to its section by
+    bisecting the start-offset table — one finditer pass per edition
+    instead of one per section.
+    """
+    offsets: list[int] = []
+    section_ids: list[int] = []
+    parts: list[str] = []
+    pos = 0
+    for draft in drafts:
+        content = draft["content"] or ""
+        offsets.append(pos)
+        section_ids.append(draft["id"])
+        parts.append(content)
+        pos += len(content) + 1
+        parts.append("\x00")
+    buffer = "".join(parts)
+
     flags: list[dict] = []
-    for pattern_def in REGEX_PATTERNS:
-        for match in pattern_def["pattern"].finditer(content):
-            flags.append({
-                "section_draft_id": section_draft_id,
-                "severity": pattern_def["severity"],
-                "flag_type": pattern_def["name"],
-                "matched_text": match.group(0),
-                "rule_reference": pattern_def["rule_reference"],
-                "explanation": pattern_def["explanation"],
-                "recommended_action": pattern_def["recommended_action"],
-                "pass_number": 1,
-            })
+    for match in _COMBINED_PATTERN.finditer(buffer):
+        rule = _RULES_BY_NAME[match.lastgroup]
+        section_idx = bisect.bisect_right(offsets, match.start()) - 1
+        flags.append({
+            "section_draft_id": section_ids[section_idx],
+            "severity": rule.severity,
+            "flag_type": rule.name,
+            "matched_text": match.group(0),
+            "rule_reference": rule.rule_reference,
+            "explanation": rule.explanation,
+            "recommended_action": rule.recommended_action,
+            "pass_number": 1,
+        })
     return flags
 
 
@@ -254,23 +314,20 @@ async def _run_pass_2(
     if not raw.strip():
         return []
 
-    # Strip markdown code fences if present
-    cleaned = raw.strip()
-    if cleaned.startswith("```"):
-        # Remove opening fence (with optional language tag)
-        cleaned = re.sub(r"^```\w*\n?", "", cleaned)
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    cleaned = cleaned.strip()
-
     try:
-        parsed = json.loads(cleaned)
-    except json.JSONDecodeError:
-        logger.warning(
-            "Section %s: failed to parse Gemini compliance JSON: %.200s",
-            section_name, cleaned,
-        )
-        return []
+        parsed = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Fallback for SDK/model combinations that ignore the JSON mime
+        # type and still wrap the payload in markdown fences
+        cleaned = _strip_json_fences(raw)
+        try:
+            parsed = orjson.loads(cleaned)
+        except orjson.JSONDecodeError:
+            logger.warning(
+                "Section %s: failed to parse Gemini compliance JSON: %.200s",
+                section_name, cleaned,
+            )
+            return []
 
     raw_flags = parsed.get("flags", [])
     if not isinstance(raw_flags, list):
@@ -301,8 +358,7 @@ async def _run_pass_2(
 
 async def _store_flags(flags: list[dict]) -> None:
     """Insert compliance flags into the database."""
-    db = await get_db()
-    try:
+    async with get_write_db() as db:
         await db.executemany(
             "INSERT INTO compliance_flags "
             "(section_draft_id, severity, flag_type, matched_text, "
@@ -323,12 +379,51 @@ async def _store_flags(flags: list[dict]) -> None:
             ],
         )
         await db.commit()
-    finally:
-        await db.close()
 
 
+async def _cache_annotations(drafts: list[dict]) -> None:
+    """Precompute and store highlight HTML for each scanned draft.
+
+    Annotation depends only on flag identity and matched text (not
+    resolution state), so the cache stays valid until the next pipeline
+    run regenerates the drafts.
+    """
+    section_ids = [d["id"] for d in drafts]
+    if not section_ids:
+        return
+
+    placeholders = ",".join("?" * len(section_ids))
+    async with get_db() as db:
+        cursor = await db.execute(
+            "SELECT id, section_draft_id, severity, matched_text "
+            f"FROM compliance_flags WHERE section_draft_id IN ({placeholders})",
+            section_ids,
+        )
+        all_flags = [dict(row) for row in await cursor.fetchall()]
+
+    flags_by_section: dict[int, list[dict]] = {sid: [] for sid in section_ids}
+    for f in all_flags:
+        flags_by_section[f["section_draft_id"]].append(f)
+
+    rows = []
+    for draft in drafts:
+        section_flags = flags_by_section.get(draft["id"], [])
+        if draft["content"] and section_flags:
+            annotated = annotate_content(draft["content"], section_flags)
+        else:
+            annotated = None
+        rows.append((annotated, draft["id"]))
+
+    async with get_write_db() as db:
+        await db.executemany(
+            "UPDATE section_drafts SET annotated_content = ? WHERE id = ?", rows
+        )
+        await db.commit()
+
+
+@functools.lru_cache(maxsize=1)
 def _load_compliance_framework() -> str:
-    """Load the compliance framework markdown file."""
+    """Load the compliance framework markdown file (read once per process)."""
     path = (
         Path(__file__).resolve().parent.parent
         / "compliance"
@@ -339,3 +434,11 @@ def _load_compliance_framework() -> str:
     except FileNotFoundError:
         logger.warning("Compliance framework file not found at %s", path)
         return ""
+
+
+@functools.lru_cache(maxsize=1)
+def _compliance_system_prompt() -> str:
+    """System prompt with the framework injected, formatted once per process."""
+    return COMPLIANCE_SYSTEM_PROMPT.format(
+        compliance_framework=_load_compliance_framework()
+    )
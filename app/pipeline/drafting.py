@@ -5,20 +5,23 @@ import time
 import google.generativeai as genai
 
 from app.config import settings
-from app.database import get_db
-from app.pipeline.gemini_utils import call_with_retry
+from app.database import get_db, get_write_db
+from app.pipeline.gemini_utils import call_with_retry, get_model
 from app.pipeline.prompts import (
+    LLM_EXCLUDED_SECTIONS,
     NO_ARTICLES_ADDENDUM,
     PERSPECTIVE_PLACEHOLDER,
     SECTION_ARTICLE_LIMITS,
     SECTION_CATEGORIES,
     SECTION_ORDER,
-    SECTION_PROMPTS,
     VOICE_SYSTEM_PROMPT,
+    render_section_prompt,
 )
 
 logger = logging.getLogger(__name__)
 
+_PERSPECTIVE_WORD_COUNT = len(PERSPECTIVE_PLACEHOLDER.split())
+
 
 # ============================= PUBLIC API ==================================
 
@@ -26,27 +29,18 @@ logger = logging.getLogger(__name__)
 async def run_drafting(edition_id: int, *, editorial_brief: str | None = None) -> None:
     """Generate all newsletter sections for an edition using Gemini.
 
-    Sections are generated sequentially to respect rate limits.
-    If the Gemini API key is not set, logs a warning and returns.
+    Section calls overlap under the configured concurrency limit; results
+    are stored in SECTION_ORDER. If the Gemini API key is not set, logs a
+    warning and returns.
     """
     if not settings.gemini_api_key:
         logger.warning("Gemini API key not set — skipping drafting")
         return
 
-    genai.configure(api_key=settings.gemini_api_key)
-
-    model = genai.GenerativeModel(
-        model_name="gemini-2.5-flash",
-        system_instruction=VOICE_SYSTEM_PROMPT,
-        generation_config=genai.GenerationConfig(
-            temperature=0.7,
-            max_output_tokens=4096,
-        ),
-    )
+    model = get_model("gemini-2.5-flash", VOICE_SYSTEM_PROMPT, 0.7, 4096)
 
     # Fetch all usable articles for this edition (one query, filter in memory)
-    db = await get_db()
-    try:
+    async with get_db() as db:
         cursor = await db.execute(
             "SELECT id, title, url, source, source_tier, relevance_category, raw_snippet "
             "FROM articles WHERE edition_id = ? AND is_duplicate = 0 AND quality_score > 0 "
@@ -54,8 +48,6 @@ async def run_drafting(edition_id: int, *, editorial_brief: str | None = None) -
             (edition_id,),
         )
         all_articles = [dict(row) for row in await cursor.fetchall()]
-    finally:
-        await db.close()
 
     logger.info(
         "Edition %d: drafting %d sections with %d usable articles (model=%s)",
@@ -64,13 +56,63 @@ async def run_drafting(edition_id: int, *, editorial_brief: str | None = None) -
 
     start_time = time.monotonic()
 
-    gemini_call_count = 0
+    # Sections are independent, so the Gemini calls overlap under a
+    # bounded semaphore. Results are stored afterwards in SECTION_ORDER
+    # so insertion ids (and therefore page ordering) stay deterministic.
+    sem = asyncio.Semaphore(settings.gemini_concurrency)
+
+    async def _draft_one(section_name: str) -> str:
+        async with sem:
+            return await _generate_section_content(
+                edition_id, section_name, model,
+                articles_by_section[section_name], editorial_brief,
+            )
+
+    llm_sections = [s for s in SECTION_ORDER if s not in LLM_EXCLUDED_SECTIONS]
+
+    # Bucket articles per section in one pass over the score-ordered list
+    # instead of re-filtering all_articles for every section
+    articles_by_section: dict[str, list[dict]] = {s: [] for s in llm_sections}
+    section_wants = {
+        s: (set(SECTION_CATEGORIES.get(s, [])), SECTION_ARTICLE_LIMITS.get(s, 5))
+        for s in llm_sections
+    }
+    for article in all_articles:
+        category = article.get("relevance_category")
+        for section_name, (categories, limit) in section_wants.items():
+            bucket = articles_by_section[section_name]
+            if category in categories and len(bucket) < limit:
+                bucket.append(article)
+
+    results = await asyncio.gather(
+        *(_draft_one(s) for s in llm_sections), return_exceptions=True
+    )
+    content_by_section = dict(zip(llm_sections, results))
+
     for section_name in SECTION_ORDER:
-        if section_name != "perspective" and gemini_call_count > 0:
-            await asyncio.sleep(2)
-        await _generate_section(edition_id, section_name, model, all_articles, editorial_brief)
-        if section_name != "perspective":
-            gemini_call_count += 1
+        if section_name == "perspective":
+            await _store_section(
+                edition_id, section_name, PERSPECTIVE_PLACEHOLDER, model_used="static"
+            )
+            logger.info(
+                "Edition %d [%s]: stored placeholder (%d words)",
+                edition_id, section_name, _PERSPECTIVE_WORD_COUNT,
+            )
+            continue
+        content = content_by_section[section_name]
+        if isinstance(content, BaseException):
+            logger.error(
+                "Edition %d [%s]: drafting failed: %s",
+                edition_id, section_name, content,
+            )
+            content = "[Draft generation failed for this section. Error logged.]"
+        word_count = await _store_section(
+            edition_id, section_name, content, model_used="gemini-2.5-flash"
+        )
+        logger.info(
+            "Edition %d [%s]: %d words generated",
+            edition_id, section_name, word_count,
+        )
 
     elapsed = round(time.monotonic() - start_time, 1)
     logger.info("Edition %d: drafting complete in %.1fs", edition_id, elapsed)
@@ -79,50 +121,30 @@ async def run_drafting(edition_id: int, *, editorial_brief: str | None = None) -
 # ============================= HELPERS =====================================
 
 
-async def _generate_section(
+async def _generate_section_content(
     edition_id: int,
     section_name: str,
     model: genai.GenerativeModel,
-    all_articles: list[dict],
+    section_articles: list[dict],
     editorial_brief: str | None = None,
-) -> None:
-    """Generate and store a single newsletter section."""
-
-    # Perspective — static placeholder, no LLM call
-    if section_name == "perspective":
-        await _store_section(
-            edition_id, section_name, PERSPECTIVE_PLACEHOLDER, model_used="static"
-        )
-        word_count = len(PERSPECTIVE_PLACEHOLDER.split())
-        logger.info(
-            "Edition %d [%s]: stored placeholder (%d words)",
-            edition_id, section_name, word_count,
-        )
-        return
-
-    # Filter articles by relevance category for this section
-    categories = SECTION_CATEGORIES.get(section_name, [])
-    limit = SECTION_ARTICLE_LIMITS.get(section_name, 5)
-    section_articles = [
-        a for a in all_articles
-        if a.get("relevance_category") in categories
-    ][:limit]
+) -> str:
+    """Generate the content for a single newsletter section via Gemini."""
 
     # Format articles for prompt context
     articles_context = _format_articles(section_articles) if section_articles else ""
 
     # Build prompt
-    prompt_template = SECTION_PROMPTS[section_name]
-    prompt = prompt_template.format(articles_context=articles_context)
+    prompt = render_section_prompt(section_name, articles_context)
     if not section_articles:
         prompt += NO_ARTICLES_ADDENDUM
 
-    # Prepend editorial direction for guided mode
+    # Guided-mode direction goes at the end, not the front: the section
+    # prompt prefix stays byte-identical across editions so provider
+    # prefix caching keeps working when a brief is supplied
     if editorial_brief:
-        prompt = (
-            f"EDITORIAL DIRECTION: {editorial_brief}\n"
-            "Prioritize this theme in your analysis while maintaining balanced coverage.\n\n"
-            + prompt
+        prompt += (
+            f"\n\nEDITORIAL DIRECTION: {editorial_brief}\n"
+            "Prioritize this theme in your analysis while maintaining balanced coverage."
         )
 
     logger.info(
@@ -136,48 +158,45 @@ async def _generate_section(
             lambda: model.generate_content_async(prompt),
             label=f"Edition {edition_id} [{section_name}]",
         )
-        content = response.text if response.text else "[No content generated]"
+        return response.text if response.text else "[No content generated]"
     except Exception:
         logger.exception(
             "Edition %d [%s]: Gemini call failed", edition_id, section_name
         )
-        content = "[Draft generation failed for this section. Error logged.]"
-
-    # Store result
-    await _store_section(edition_id, section_name, content, model_used="gemini-2.5-flash")
-    word_count = len(content.split())
-    logger.info(
-        "Edition %d [%s]: %d words generated", edition_id, section_name, word_count
-    )
+        return "[Draft generation failed for this section. Error logged.]"
 
 
 def _format_articles(articles: list[dict]) -> str:
-    """Format a list of article dicts for injection into an LLM prompt."""
-    parts: list[str] = []
+    """Format a list of article dicts for injection into an LLM prompt.
+
+    Builds one flat line buffer joined once — no per-article
+    intermediate strings. Output matches the old nested join exactly.
+    """
+    buf: list[str] = []
+    append = buf.append
     for i, a in enumerate(articles, 1):
-        lines = [f"[{i}] {a['title']}"]
-        lines.append(f"Source: {a.get('source', 'unknown')} (Tier {a.get('source_tier', 3)})")
+        if buf:
+            append("")  # blank line between articles
+        append(f"[{i}] {a['title']}")
+        append(f"Source: {a.get('source', 'unknown')} (Tier {a.get('source_tier', 3)})")
         if a.get("url"):
-            lines.append(f"URL: {a['url']}")
+            append(f"URL: {a['url']}")
         snippet = a.get("raw_snippet", "")
         if snippet:
-            lines.append(f"Summary: {snippet[:500]}")
-        parts.append("\n".join(lines))
-    return "\n\n".join(parts)
+            append(f"Summary: {snippet[:500]}")
+    return "\n".join(buf)
 
 
 async def _store_section(
     edition_id: int, section_name: str, content: str, model_used: str
-) -> None:
-    """Insert a section draft into the database."""
+) -> int:
+    """Insert a section draft into the database. Returns the word count."""
     word_count = len(content.split())
-    db = await get_db()
-    try:
+    async with get_write_db() as db:
         await db.execute(
             "INSERT INTO section_drafts (edition_id, section_name, content, word_count, model_used) "
             "VALUES (?, ?, ?, ?, ?)",
             (edition_id, section_name, content, word_count, model_used),
         )
         await db.commit()
-    finally:
-        await db.close()
+    return word_count
@@ -1,18 +1,56 @@
 import asyncio
+import functools
 import logging
+import random
 from collections.abc import Awaitable, Callable
 from typing import TypeVar
 
+import google.generativeai as genai
+
 try:
     from google.api_core.exceptions import ResourceExhausted
 except ImportError:
     ResourceExhausted = None
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
-_RETRY_DELAYS = [15, 30]
+
+@functools.lru_cache(maxsize=8)
+def get_model(
+    model_name: str,
+    system_instruction: str | None,
+    temperature: float,
+    max_output_tokens: int,
+    response_mime_type: str | None = None,
+) -> genai.GenerativeModel:
+    """Build a GenerativeModel once per unique configuration.
+
+    Drafting, compliance and guided-query generation all reuse their
+    model instances across editions instead of reconstructing SDK
+    client state per run. genai.configure is idempotent and cheap, so
+    it simply runs with each (rare) cache miss.
+    """
+    genai.configure(api_key=settings.gemini_api_key)
+    config_kwargs: dict = {
+        "temperature": temperature,
+        "max_output_tokens": max_output_tokens,
+    }
+    if response_mime_type is not None:
+        config_kwargs["response_mime_type"] = response_mime_type
+    return genai.GenerativeModel(
+        model_name=model_name,
+        system_instruction=system_instruction,
+        generation_config=genai.GenerationConfig(**config_kwargs),
+    )
+
+
+_MAX_ATTEMPTS = 4
+_BASE_DELAY = 2.0
+_MAX_DELAY = 60.0
 
 
 async def call_with_retry(
@@ -20,36 +58,55 @@ async def call_with_retry(
     *,
     label: str = "Gemini call",
 ) -> T:
-    """Call an async Gemini function with retry on rate-limit (429) errors.
-
-    Attempts the call up to 3 times:
-      1. Initial attempt
-      2. On 429: wait 15s, retry
-      3. On 429: wait 30s, retry
-    If all 3 attempts fail with 429, re-raises the last exception.
-    Non-429 errors are raised immediately.
+    """Call an async Gemini function with retry on 429s and timeouts.
+
+    Each attempt is bounded by GEMINI_TIMEOUT_S so a hung socket cannot
+    stall the pipeline indefinitely. Waits the server-hinted retry delay
+    when a 429 carries one; otherwise backs off exponentially with
+    jitter (so concurrent callers don't retry in lockstep). Other
+    errors are raised immediately.
     """
-    last_exc: Exception | None = None
-    for attempt in range(3):
+    last_exc: Exception
+    for attempt in range(_MAX_ATTEMPTS):
         try:
-            return await fn()
+            return await asyncio.wait_for(fn(), timeout=settings.gemini_timeout_s)
+        except asyncio.TimeoutError as exc:
+            last_exc = exc
+            reason = f"timed out after {settings.gemini_timeout_s}s"
+            hinted = None
         except Exception as exc:
             if not _is_rate_limit(exc):
                 raise
             last_exc = exc
-            if attempt < len(_RETRY_DELAYS):
-                delay = _RETRY_DELAYS[attempt]
-                logger.warning(
-                    "%s: rate limited (429), waiting %ds before retry %d/2",
-                    label, delay, attempt + 1,
-                )
-                await asyncio.sleep(delay)
-            else:
-                logger.error(
-                    "%s: rate limited (429) after 3 attempts, giving up", label
-                )
-                raise
-    raise last_exc  # type: ignore[misc]
+            reason = "rate limited (429)"
+            hinted = _server_hinted_delay(exc)
+        if attempt == _MAX_ATTEMPTS - 1:
+            logger.error(
+                "%s: %s after %d attempts, giving up", label, reason, _MAX_ATTEMPTS
+            )
+            raise last_exc
+        if hinted is not None:
+            delay, source = hinted, "server hint"
+        else:
+            delay = min(_MAX_DELAY, _BASE_DELAY * 2 ** attempt)
+            delay *= random.uniform(0.5, 1.5)
+            source = "backoff"
+        logger.warning(
+            "%s: %s, waiting %.1fs (%s) before retry %d/%d",
+            label, reason, delay, source, attempt + 1, _MAX_ATTEMPTS - 1,
+        )
+        await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")  # loop always returns or raises
+
+
+def _server_hinted_delay(exc: Exception) -> float | None:
+    """Extract the server-suggested retry delay from a 429, if present."""
+    retry_delay = getattr(exc, "retry_delay", None)
+    if retry_delay is not None:
+        seconds = getattr(retry_delay, "seconds", None)
+        if seconds:
+            return float(seconds)
+    return None
 
 
 def _is_rate_limit(exc: Exception) -> bool:
@@ -3,6 +3,11 @@
 # All prompts live here. No prompts hardcoded in other files.
 # ---------------------------------------------------------------------------
 
+from types import MappingProxyType
+
+# Sent verbatim as the system instruction on every drafting call — keep
+# it byte-identical (no interpolation, always first) so provider-side
+# prefix caching can skip its prefill.
 VOICE_SYSTEM_PROMPT = (
     "You are the editorial voice of The Find Brief, a newsletter published by "
     "The Find Capital LLC, a cross-border real estate capital advisory firm. "
@@ -61,7 +66,7 @@ VOICE_SYSTEM_PROMPT = (
 # Each receives {articles_context} with formatted article data.
 # ---------------------------------------------------------------------------
 
-SECTION_PROMPTS: dict[str, str] = {
+SECTION_PROMPTS: MappingProxyType[str, str] = MappingProxyType({
     "market_pulse": (
         "Write the Market Pulse section (250-350 words). Analyze current "
         "macroeconomic conditions affecting cross-border real estate capital "
@@ -100,9 +105,23 @@ SECTION_PROMPTS: dict[str, str] = {
         "[Source Name].\n\n"
         "Source material:\n\n{articles_context}"
     ),
+})
+
+
+# Each prompt split once on its placeholder so the hot path is plain
+# string concatenation instead of re-parsing the format spec per call.
+_SECTION_PROMPT_PARTS: dict[str, tuple[str, str]] = {
+    name: tuple(template.split("{articles_context}", 1))
+    for name, template in SECTION_PROMPTS.items()
 }
 
 
+def render_section_prompt(name: str, articles_context: str) -> str:
+    """Render a section prompt with its article context injected."""
+    prefix, suffix = _SECTION_PROMPT_PARTS[name]
+    return f"{prefix}{articles_context}{suffix}"
+
+
 PERSPECTIVE_PLACEHOLDER = (
     "This section is reserved for partner commentary. Francisco and Juliana "
     "will provide their perspective on the most significant development "
@@ -123,40 +142,46 @@ NO_ARTICLES_ADDENDUM = (
 # Section ordering and display names
 # ---------------------------------------------------------------------------
 
-SECTION_ORDER: list[str] = [
+# Read-only after import: the order tuple and the mapping proxies below
+# can't be mutated at runtime, which also keeps them safe as cache keys.
+SECTION_ORDER: tuple[str, ...] = (
     "market_pulse",
     "regional_spotlight",
     "capital_flows",
     "regulatory_watch",
     "perspective",
-]
+)
 
-SECTION_DISPLAY_NAMES: dict[str, str] = {
+# Sections that never go through the LLM (static placeholder content);
+# drafting and both compliance passes skip these.
+LLM_EXCLUDED_SECTIONS: frozenset[str] = frozenset({"perspective"})
+
+SECTION_DISPLAY_NAMES: MappingProxyType[str, str] = MappingProxyType({
     "market_pulse": "Market Pulse",
     "regional_spotlight": "Regional Spotlight",
     "capital_flows": "Capital Flows",
     "regulatory_watch": "Regulatory Watch",
     "perspective": "The Find's Perspective",
-}
+})
 
 
 # ---------------------------------------------------------------------------
 # Section → relevance_category mapping
 # ---------------------------------------------------------------------------
 
-SECTION_CATEGORIES: dict[str, list[str]] = {
-    "market_pulse": ["macro"],
-    "regional_spotlight": ["regional"],
-    "capital_flows": ["deals"],
-    "regulatory_watch": ["regulatory"],
-}
+SECTION_CATEGORIES: MappingProxyType[str, tuple[str, ...]] = MappingProxyType({
+    "market_pulse": ("macro",),
+    "regional_spotlight": ("regional",),
+    "capital_flows": ("deals",),
+    "regulatory_watch": ("regulatory",),
+})
 
-SECTION_ARTICLE_LIMITS: dict[str, int] = {
+SECTION_ARTICLE_LIMITS: MappingProxyType[str, int] = MappingProxyType({
     "market_pulse": 5,
     "regional_spotlight": 5,
     "capital_flows": 5,
     "regulatory_watch": 3,
-}
+})
 
 
 # ---------------------------------------------------------------------------
@@ -210,7 +235,7 @@ COMPLIANCE_USER_TEMPLATE = (
 )
 
 
-DISCLAIMER_TEXTS: dict[str, str] = {
+DISCLAIMER_TEXTS: MappingProxyType[str, str] = MappingProxyType({
     "GENERAL": (
         "This newsletter is for informational purposes only and does not "
         "constitute investment advice. Securities offered through Finalis "
@@ -232,4 +257,4 @@ DISCLAIMER_TEXTS: dict[str, str] = {
         "Information based on publicly available sources and does not "
         "constitute an endorsement or solicitation."
     ),
-}
+})
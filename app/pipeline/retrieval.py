@@ -1,19 +1,44 @@
 import asyncio
-import json
+import csv
+import functools
+import hashlib
 import logging
 import re
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-import google.generativeai as genai
 import httpx
+import orjson
 
 from app.config import settings
-from app.database import get_db
-from app.pipeline.gemini_utils import call_with_retry
+from app.database import get_db, get_write_db
+from app.pipeline.gemini_utils import call_with_retry, get_model
+from app.pipeline.prompts import SECTION_ARTICLE_LIMITS, SECTION_CATEGORIES
 
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+_EDGAR_HEADERS = {
+    "User-Agent": "TheFindBrief/1.0 (contact@thefindcapital.com)",
+    "Accept": "application/json",
+}
+
+# Every vendor host touched by the fan-out, prewarmed before the real
+# requests race so none of them serializes behind DNS + TLS setup
+_PREWARM_HOSTS = (
+    "api.perplexity.ai",
+    "serpapi.com",
+    "efts.sec.gov",
+    "fred.stlouisfed.org",
+)
+
+# Caps in-flight requests across all retrieval sources so a larger query
+# fan-out can't trip vendor rate limits (whose backoff costs far more
+# than the lost parallelism).
+_HTTP_SEM = asyncio.Semaphore(settings.max_concurrent_requests)
 
 # ---------------------------------------------------------------------------
 # Perplexity queries: (user_query, relevance_category)
@@ -41,6 +66,9 @@ _PERPLEXITY_QUERIES = [
     ),
 ]
 
+# Keep this byte-identical across queries and editions: it is always
+# message[0], so provider-side prefix caching can skip its prefill.
+# Any dynamic content belongs in the user message, never here.
 _PERPLEXITY_SYSTEM = (
     "You are a financial research assistant. Return a list of recent news "
     "articles, reports, or data points about the topic. For each item, "
@@ -67,10 +95,40 @@ _FRED_SERIES = [
     ("CPIAUCSL", "CPI"),
 ]
 
+# Per-category article budget: 3x what any section can surface. Articles
+# beyond the cap would never reach a prompt, so parsing stops early and
+# the rows are never written. Counts are module state reset per run —
+# the concurrent-pipeline guard means only one retrieval runs at a time.
+_CATEGORY_CAP: dict[str, int] = {
+    category: 3 * limit
+    for section, limit in SECTION_ARTICLE_LIMITS.items()
+    for category in SECTION_CATEGORIES.get(section, [])
+}
+_category_counts: dict[str, int] = {}
+
+
+def _category_full(category: str) -> bool:
+    cap = _CATEGORY_CAP.get(category)
+    return cap is not None and _category_counts.get(category, 0) >= cap
+
+
+def _count_category(category: str) -> None:
+    _category_counts[category] = _category_counts.get(category, 0) + 1
+
+
 # ---------------------------------------------------------------------------
-# URL extraction regex
+# Response-parsing regexes (compiled once; the markdown cleanup runs in a
+# hot per-item loop)
 # ---------------------------------------------------------------------------
-_URL_RE = re.compile(r"https?://[^\s\)\]\>,\"']+")
+_URL_RE = re.compile(r"https?://[^\s)\]>,\"']+")
+_NUM_SPLIT_RE = re.compile(r"\n\s*\d+[\.\)]\s+")
+_BULLET_SPLIT_RE = re.compile(r"\n\s*[\-\*\u2022]\s+")
+# Markdown links and bold in one alternation — a single pass strips both
+_MD_CLEAN_RE = re.compile(r"\[([^\]]+)\]\([^\)]+\)|\*\*([^*]+)\*\*")
+
+
+def _strip_markdown(title: str) -> str:
+    return _MD_CLEAN_RE.sub(lambda m: m.group(1) or m.group(2), title)
 
 
 # ============================= PUBLIC API ==================================
@@ -99,30 +157,52 @@ async def run_retrieval(edition_id: int, *, editorial_brief: str | None = None)
         perplexity_queries = _PERPLEXITY_QUERIES
         serpapi_queries = _SERPAPI_QUERIES
 
-    tasks = [
-        _fetch_perplexity(edition_id, queries=perplexity_queries),
-        _fetch_serpapi(edition_id, queries=serpapi_queries),
-        _fetch_edgar(edition_id),
-        _fetch_fred(edition_id),
-    ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    all_articles: list[dict] = []
-    source_names = ["perplexity", "serpapi", "edgar", "fred"]
-
-    for name, result in zip(source_names, results):
-        if isinstance(result, Exception):
-            logger.error("Source %s failed: %s", name, result)
-            continue
-        logger.info("Source %s returned %d articles", name, len(result))
-        all_articles.extend(result)
+    async def _named(name: str, coro) -> tuple[str, list[dict]]:
+        try:
+            return name, await coro
+        except Exception as exc:
+            logger.error("Source %s failed: %s", name, exc)
+            return name, []
+
+    # One client for every source: connections (and TLS sessions) are
+    # pooled across the whole fan-out, and HTTP/2 multiplexes the
+    # per-vendor query fan-outs over one connection each. Each source's
+    # articles stream to the DB as soon as they land instead of waiting
+    # for the slowest fetch, which also caps peak memory at the largest
+    # single source.
+    total = 0
+    seen_urls: set[str] = set()
+    _category_counts.clear()
+    async with httpx.AsyncClient(
+        timeout=_TIMEOUT, limits=_LIMITS, http2=True
+    ) as client:
+        # Resolve DNS and complete TLS handshakes to all vendors up
+        # front; failures here are irrelevant (the real fetch handles
+        # its own errors) so results are discarded.
+        await asyncio.gather(
+            *(client.head(f"https://{host}/", timeout=2.0) for host in _PREWARM_HOSTS),
+            return_exceptions=True,
+        )
 
-    if all_articles:
-        count = await _store_articles(all_articles)
+        tasks = [
+            asyncio.create_task(_named("perplexity", _fetch_perplexity(client, edition_id, queries=perplexity_queries))),
+            asyncio.create_task(_named("serpapi", _fetch_serpapi(client, edition_id, queries=serpapi_queries))),
+            asyncio.create_task(_named("edgar", _fetch_edgar(client, edition_id))),
+            asyncio.create_task(_named("fred", _fetch_fred(client, edition_id))),
+        ]
+        for completed in asyncio.as_completed(tasks):
+            name, articles = await completed
+            logger.info("Source %s returned %d articles", name, len(articles))
+            if articles:
+                articles = _dedupe_by_url(articles, seen_urls)
+            if articles:
+                total += await _store_articles(articles)
+
+    if total:
         logger.info(
-            "Edition %d: stored %d articles total from retrieval", edition_id, count
+            "Edition %d: stored %d articles total from retrieval", edition_id, total
         )
-        return count
+        return total
 
     logger.warning("Edition %d: no articles retrieved from any source", edition_id)
     return 0
@@ -139,13 +219,7 @@ async def _generate_guided_queries(
     Returns (perplexity_queries, serpapi_queries) where each is a list of
     (query_text, relevance_category) tuples.
     """
-    genai.configure(api_key=settings.gemini_api_key)
-    model = genai.GenerativeModel(
-        model_name="gemini-2.5-flash",
-        generation_config=genai.GenerationConfig(
-            temperature=0.3, max_output_tokens=2048
-        ),
-    )
+    model = get_model("gemini-2.5-flash", None, 0.3, 2048)
 
     prompt = (
         "You are a research query generator for a cross-border real estate capital newsletter.\n\n"
@@ -169,7 +243,7 @@ async def _generate_guided_queries(
         raw = re.sub(r"^```(?:json)?\s*", "", raw)
         raw = re.sub(r"\s*```$", "", raw)
 
-    data = json.loads(raw)
+    data = orjson.loads(raw)
 
     perplexity_queries = [
         (item["query"], item["category"]) for item in data["perplexity"]
@@ -181,23 +255,125 @@ async def _generate_guided_queries(
     return perplexity_queries, serpapi_queries
 
 
+# ============================= RESULT CACHE ================================
+# Search queries are static (or stable within a day in guided mode), and
+# vendors return near-identical results for the same query within a day.
+# Parsed article lists are cached in SQLite keyed by (vendor, query, day)
+# so repeat pipeline runs skip the API round-trip entirely. Disable with
+# RETRIEVAL_CACHE_DISABLED=1 to force fresh fetches.
+
+
+def _cache_key(vendor: str, query: str) -> str:
+    day = datetime.now().strftime("%Y-%m-%d")
+    return hashlib.sha256(f"{vendor}|{query}|{day}".encode("utf-8")).hexdigest()
+
+
+async def _cache_get(vendor: str, query: str, edition_id: int) -> list[dict] | None:
+    if settings.retrieval_cache_disabled:
+        return None
+    async with get_db() as db:
+        cursor = await db.execute(
+            "SELECT articles FROM retrieval_cache WHERE cache_key = ?",
+            (_cache_key(vendor, query),),
+        )
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    articles = orjson.loads(row["articles"])
+    # Cached rows were parsed for an earlier edition — restamp them
+    for article in articles:
+        article["edition_id"] = edition_id
+    logger.info("%s cache hit for %r", vendor, query[:60])
+    return articles
+
+
+async def _cache_put(vendor: str, query: str, articles: list[dict]) -> None:
+    if settings.retrieval_cache_disabled or not articles:
+        return
+    async with get_write_db() as db:
+        await db.execute(
+            "INSERT OR REPLACE INTO retrieval_cache (cache_key, articles) VALUES (?, ?)",
+            (_cache_key(vendor, query), orjson.dumps(articles).decode()),
+        )
+        # Day-keyed entries go stale fast; sweep old rows opportunistically
+        await db.execute(
+            "DELETE FROM retrieval_cache WHERE created_at < datetime('now', '-2 days')"
+        )
+        await db.commit()
+
+
 # ============================= STORAGE =====================================
 
+# Query parameters that vary per click but never change the document
+_TRACKING_PARAMS = frozenset({
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "gclid", "fbclid",
+})
+
+
+def _canonicalize_url(url: str) -> str:
+    """Normalize a URL for cross-source deduplication.
+
+    Lowercases scheme/host, drops tracking parameters and the fragment,
+    and sorts the remaining query so equivalent links compare equal.
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, "")
+    )
+
+
+def _dedupe_by_url(articles: list[dict], seen: set[str]) -> list[dict]:
+    """Drop articles whose canonical URL was already stored this run.
+
+    The same story often arrives from multiple sources (SerpAPI
+    aggregates the URLs Perplexity cites); skipping repeats saves the
+    insert and, more importantly, duplicate prompt context downstream.
+    Articles without URLs always pass through.
+    """
+    unique: list[dict] = []
+    for article in articles:
+        url = article.get("url")
+        if url:
+            key = _canonicalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(article)
+    return unique
+
+
 
 async def _store_articles(articles: list[dict]) -> int:
     """Insert article dicts into the articles table. Returns count inserted."""
-    db = await get_db()
-    try:
+    # Positional tuples: named binds hash the string keys per row.
+    # retrieved_at_epoch lets scoring do integer math instead of
+    # re-parsing ISO timestamps every verification run.
+    now_epoch = int(time.time())
+    rows = [
+        (
+            a["edition_id"], a["title"], a["url"], a["source"],
+            a["source_tier"], a["relevance_category"], a["raw_snippet"],
+            now_epoch,
+        )
+        for a in articles
+    ]
+    async with get_write_db() as db:
         await db.executemany(
-            """INSERT INTO articles
-               (edition_id, title, url, source, source_tier, relevance_category, raw_snippet)
-               VALUES (:edition_id, :title, :url, :source, :source_tier, :relevance_category, :raw_snippet)""",
-            articles,
+            "INSERT INTO articles "
+            "(edition_id, title, url, source, source_tier, relevance_category, raw_snippet, retrieved_at_epoch) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
         )
         await db.commit()
-        return len(articles)
-    finally:
-        await db.close()
+        return len(rows)
 
 
 # ============================= PERPLEXITY ==================================
@@ -210,24 +386,41 @@ async def _perplexity_single_query(
     edition_id: int,
 ) -> list[dict]:
     """Send one query to Perplexity and parse the response forgivingly."""
-    resp = await client.post(
-        "https://api.perplexity.ai/chat/completions",
-        json={
-            "model": "sonar",
-            "messages": [
-                {"role": "system", "content": _PERPLEXITY_SYSTEM},
-                {"role": "user", "content": query},
-            ],
-        },
-    )
+    cached = await _cache_get("perplexity", query, edition_id)
+    if cached is not None:
+        return cached
+
+    async with _HTTP_SEM:
+        resp = await client.post(
+            "https://api.perplexity.ai/chat/completions",
+            headers={"Authorization": f"Bearer {settings.perplexity_api_key}"},
+            json={
+                "model": "sonar",
+                "messages": [
+                    {"role": "system", "content": _PERPLEXITY_SYSTEM},
+                    {"role": "user", "content": query},
+                ],
+            },
+        )
     resp.raise_for_status()
-    data = resp.json()
-    content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+    data = orjson.loads(resp.content)
+
+    # Surface provider-side prompt-cache hits for the shared system
+    # prompt so cache behavior is verifiable from the logs
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Perplexity usage for %r: %s", query[:60], data.get("usage"))
+
+    try:
+        content = data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return []
 
-    if not content.strip():
+    if not content or not content.strip():
         return []
 
-    return _parse_perplexity_response(content, category, edition_id, query)
+    articles = _parse_perplexity_response(content, category, edition_id, query)
+    await _cache_put("perplexity", query, articles)
+    return articles
 
 
 def _parse_perplexity_response(
@@ -240,13 +433,13 @@ def _parse_perplexity_response(
     articles: list[dict] = []
 
     # Try numbered lines first: "1.", "2.", etc.
-    items = re.split(r"\n\s*\d+[\.\)]\s+", text)
+    items = _NUM_SPLIT_RE.split(text)
     # First split element is text before "1." — usually empty or preamble
     if len(items) > 1:
         items = items[1:]  # drop preamble
     else:
         # Try bullet points
-        items = re.split(r"\n\s*[\-\*\u2022]\s+", text)
+        items = _BULLET_SPLIT_RE.split(text)
         if len(items) > 1:
             items = items[1:]
         else:
@@ -269,21 +462,26 @@ def _parse_perplexity_response(
         return articles
 
     for item in items:
+        if _category_full(category):
+            break
         item = item.strip()
         if not item:
             continue
 
-        # Try to extract a URL
-        url_match = _URL_RE.search(item)
-        url = url_match.group(0).rstrip(".)") if url_match else None
+        # Try to extract a URL — a cheap find() rejects URL-free items
+        # (common for narrative paragraphs) before the regex runs
+        url = None
+        idx = item.find("http")
+        if idx != -1:
+            url_match = _URL_RE.search(item, idx)
+            if url_match:
+                url = url_match.group(0).rstrip(".)")
 
         # Try to extract a title (first line, or text before URL, or first sentence)
         lines = item.split("\n")
         title_candidate = lines[0].strip()
         # Clean markdown bold/links from title
-        title_candidate = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", title_candidate)
-        title_candidate = re.sub(r"\*\*([^*]+)\*\*", r"\1", title_candidate)
-        title_candidate = title_candidate.strip("* -#")
+        title_candidate = _strip_markdown(title_candidate).strip("* -#")
 
         if len(title_candidate) > 200:
             title_candidate = title_candidate[:197] + "..."
@@ -301,6 +499,7 @@ def _parse_perplexity_response(
                 "raw_snippet": item[:2000],
             }
         )
+        _count_category(category)
 
     # Fallback: if parsing produced zero articles from non-empty items, store whole text
     if not articles:
@@ -320,7 +519,10 @@ def _parse_perplexity_response(
 
 
 async def _fetch_perplexity(
-    edition_id: int, *, queries: list[tuple[str, str]] | None = None
+    client: httpx.AsyncClient,
+    edition_id: int,
+    *,
+    queries: list[tuple[str, str]] | None = None,
 ) -> list[dict]:
     """Fetch articles from Perplexity API."""
     if not settings.perplexity_api_key:
@@ -330,25 +532,18 @@ async def _fetch_perplexity(
     query_list = queries if queries is not None else _PERPLEXITY_QUERIES
 
     articles: list[dict] = []
-    async with httpx.AsyncClient(
-        headers={
-            "Authorization": f"Bearer {settings.perplexity_api_key}",
-            "Content-Type": "application/json",
-        },
-        timeout=_TIMEOUT,
-    ) as client:
-        tasks = [
-            _perplexity_single_query(client, query, category, edition_id)
-            for query, category in query_list
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    tasks = [
+        _perplexity_single_query(client, query, category, edition_id)
+        for query, category in query_list
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                query_text = query_list[i][0]
-                logger.error("Perplexity query failed (%s): %s", query_text, result)
-                continue
-            articles.extend(result)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            query_text = query_list[i][0]
+            logger.error("Perplexity query failed (%s): %s", query_text, result)
+            continue
+        articles.extend(result)
 
     logger.info("Perplexity: %d articles from %d queries", len(articles), len(query_list))
     return articles
@@ -364,19 +559,26 @@ async def _serpapi_single_query(
     edition_id: int,
 ) -> list[dict]:
     """Run one SerpAPI Google News search."""
-    resp = await client.get(
-        "https://serpapi.com/search",
-        params={
-            "engine": "google_news",
-            "q": query,
-            "api_key": settings.serpapi_api_key,
-        },
-    )
+    cached = await _cache_get("serpapi", query, edition_id)
+    if cached is not None:
+        return cached
+
+    async with _HTTP_SEM:
+        resp = await client.get(
+            "https://serpapi.com/search",
+            params={
+                "engine": "google_news",
+                "q": query,
+                "api_key": settings.serpapi_api_key,
+            },
+        )
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
 
     articles: list[dict] = []
     for item in data.get("news_results", []):
+        if _category_full(category):
+            break
         title = item.get("title", "").strip()
         if not title:
             continue
@@ -391,12 +593,17 @@ async def _serpapi_single_query(
                 "raw_snippet": item.get("snippet", "")[:2000],
             }
         )
+        _count_category(category)
 
+    await _cache_put("serpapi", query, articles)
     return articles
 
 
 async def _fetch_serpapi(
-    edition_id: int, *, queries: list[tuple[str, str]] | None = None
+    client: httpx.AsyncClient,
+    edition_id: int,
+    *,
+    queries: list[tuple[str, str]] | None = None,
 ) -> list[dict]:
     """Fetch articles from SerpAPI Google News."""
     if not settings.serpapi_api_key:
@@ -406,19 +613,18 @@ async def _fetch_serpapi(
     query_list = queries if queries is not None else _SERPAPI_QUERIES
 
     articles: list[dict] = []
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        tasks = [
-            _serpapi_single_query(client, query, category, edition_id)
-            for query, category in query_list
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    tasks = [
+        _serpapi_single_query(client, query, category, edition_id)
+        for query, category in query_list
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                query_text = query_list[i][0]
-                logger.error("SerpAPI query failed (%s): %s", query_text, result)
-                continue
-            articles.extend(result)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            query_text = query_list[i][0]
+            logger.error("SerpAPI query failed (%s): %s", query_text, result)
+            continue
+        articles.extend(result)
 
     logger.info("SerpAPI: %d articles from %d queries", len(articles), len(query_list))
     return articles
@@ -427,100 +633,95 @@ async def _fetch_serpapi(
 # ============================= SEC EDGAR ===================================
 
 
-async def _fetch_edgar(edition_id: int) -> list[dict]:
-    """Fetch recent real-estate-related filings from SEC EDGAR full-text search."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    start = (datetime.now() - timedelta(days=14)).strftime("%Y-%m-%d")
+@functools.lru_cache(maxsize=2)
+def _edgar_date_range(hour_bucket: str) -> tuple[str, str]:
+    """(start, end) date strings for the EDGAR query, cached per UTC hour.
+
+    UTC keeps the range independent of host-local time, and the stable
+    URL within each hour lets any HTTP caching upstream apply.
+    """
+    today = datetime.now(timezone.utc).date()
+    return (today - timedelta(days=14)).isoformat(), today.isoformat()
+
+
+async def _fetch_edgar(client: httpx.AsyncClient, edition_id: int) -> list[dict]:
+    """Fetch recent real-estate filings from EDGAR full-text search.
+
+    Uses the JSON search-index endpoint, which returns a stable
+    Elasticsearch shape (hits.hits[]._source) and supports from/size
+    pagination — no more defensive multi-schema parsing that silently
+    returned zero filings on unknown layouts.
+    """
+    start, today = _edgar_date_range(
+        datetime.now(timezone.utc).strftime("%Y-%m-%dT%H")
+    )
 
     url = (
-        "https://efts.sec.gov/LATEST/search"
+        "https://efts.sec.gov/LATEST/search-index"
         f'?q=%22real+estate%22&dateRange=custom&startdt={start}&enddt={today}'
-        "&forms=D,8-K,S-11"
+        "&forms=D,8-K,S-11&from=0&size=25"
     )
 
-    async with httpx.AsyncClient(
-        headers={
-            "User-Agent": "TheFindBrief/1.0 (contact@thefindcapital.com)",
-            "Accept": "application/json",
-        },
-        timeout=_TIMEOUT,
-    ) as client:
-        try:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception:
-            logger.exception("EDGAR request failed")
-            return []
-
-    # Log top-level keys for debugging
-    logger.info("EDGAR response keys: %s", list(data.keys()))
-
-    articles: list[dict] = []
+    try:
+        async with _HTTP_SEM:
+            resp = await client.get(url, headers=_EDGAR_HEADERS)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+    except Exception:
+        logger.exception("EDGAR request failed")
+        return []
 
-    # Try known structures defensively
-    filings = None
-
-    if "hits" in data:
-        hits = data["hits"]
-        if isinstance(hits, dict) and "hits" in hits:
-            filings = hits["hits"]
-        elif isinstance(hits, list):
-            filings = hits
-    elif "filings" in data:
-        filings = data["filings"]
-    elif "results" in data:
-        filings = data["results"]
-    elif "data" in data:
-        filings = data["data"]
-
-    if filings is None:
+    try:
+        filings = data["hits"]["hits"]
+    except (KeyError, TypeError):
         logger.warning(
-            "EDGAR: unrecognized response structure (keys: %s) — returning empty",
+            "EDGAR: unexpected response shape (keys: %s) — returning empty",
             list(data.keys()),
         )
         return []
 
+    articles: list[dict] = []
     for filing in filings:
-        if isinstance(filing, dict):
-            # Try _source (Elasticsearch-style) or direct keys
-            source_data = filing.get("_source", filing)
-            display_names = source_data.get("display_names")
-            title = (
-                display_names[0]
-                if isinstance(display_names, list) and display_names
-                else source_data.get("entity_name")
-                or source_data.get("display_name")
-                or source_data.get("title")
-                or source_data.get("file_description")
-                or "SEC Filing"
-            )
-            form_type = source_data.get("form_type", source_data.get("forms", ""))
-            file_date = source_data.get("file_date", source_data.get("date_filed", ""))
-            file_num = source_data.get("file_num", "")
-
-            # Build URL
-            filing_id = filing.get("_id", "")
-            if filing_id:
-                filing_url = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&filenum={filing_id}&type=&dateb=&owner=include&count=10"
-            else:
-                filing_url = "https://www.sec.gov/cgi-bin/browse-edgar"
-
-            display_title = f"{form_type}: {title}" if form_type else str(title)
-            if file_date:
-                display_title += f" ({file_date})"
-
-            articles.append(
-                {
-                    "edition_id": edition_id,
-                    "title": display_title[:200],
-                    "url": filing_url,
-                    "source": "edgar",
-                    "source_tier": 1,
-                    "relevance_category": "regulatory",
-                    "raw_snippet": f"Form {form_type} filed {file_date}. File number: {file_num}."[:2000],
-                }
+        if not isinstance(filing, dict):
+            continue
+        source_data = filing.get("_source", {})
+        display_names = source_data.get("display_names")
+        title = (
+            display_names[0]
+            if isinstance(display_names, list) and display_names
+            else source_data.get("entity_name") or "SEC Filing"
+        )
+        form_type = source_data.get("form_type", source_data.get("forms", ""))
+        file_date = source_data.get("file_date", "")
+        file_num = source_data.get("file_num", "")
+
+        # Real filing landing page, built from accession number + CIK
+        adsh = source_data.get("adsh", "")
+        ciks = source_data.get("ciks") or []
+        if adsh and ciks:
+            cik = str(ciks[0]).lstrip("0") or "0"
+            filing_url = (
+                f"https://www.sec.gov/Archives/edgar/data/{cik}/"
+                f"{adsh.replace('-', '')}/{adsh}-index.htm"
             )
+        else:
+            filing_url = "https://www.sec.gov/cgi-bin/browse-edgar"
+
+        display_title = f"{form_type}: {title}" if form_type else str(title)
+        if file_date:
+            display_title += f" ({file_date})"
+
+        articles.append(
+            {
+                "edition_id": edition_id,
+                "title": display_title[:200],
+                "url": filing_url,
+                "source": "edgar",
+                "source_tier": 1,
+                "relevance_category": "regulatory",
+                "raw_snippet": f"Form {form_type} filed {file_date}. File number: {file_num}."[:2000],
+            }
+        )
 
     logger.info("EDGAR: %d filings found", len(articles))
     return articles
@@ -529,66 +730,53 @@ async def _fetch_edgar(edition_id: int) -> list[dict]:
 # ============================= FRED ========================================
 
 
-async def _fred_single_series(
-    client: httpx.AsyncClient,
-    series_id: str,
-    label: str,
-    edition_id: int,
-) -> dict | None:
-    """Fetch the latest observation for one FRED series."""
-    resp = await client.get(
-        "https://api.stlouisfed.org/fred/series/observations",
-        params={
-            "series_id": series_id,
-            "api_key": settings.fred_api_key,
-            "file_type": "json",
-            "sort_order": "desc",
-            "limit": 1,
-        },
-    )
-    resp.raise_for_status()
-    data = resp.json()
-
-    observations = data.get("observations", [])
-    if not observations:
-        return None
+async def _fetch_fred(client: httpx.AsyncClient, edition_id: int) -> list[dict]:
+    """Fetch latest macro data points from FRED.
 
-    obs = observations[0]
-    value = obs.get("value", "N/A")
-    date = obs.get("date", "unknown")
-
-    return {
-        "edition_id": edition_id,
-        "title": f"{label}: {value}% ({date})" if series_id != "CPIAUCSL" else f"{label}: {value} ({date})",
-        "url": f"https://fred.stlouisfed.org/series/{series_id}",
-        "source": "fred",
-        "source_tier": 1,
-        "relevance_category": "macro",
-        "raw_snippet": f"{label} ({series_id}): {value} as of {date}. Source: Federal Reserve Economic Data.",
-    }
-
-
-async def _fetch_fred(edition_id: int) -> list[dict]:
-    """Fetch latest macro data points from FRED."""
+    All series come back in one fredgraph CSV request (one column per
+    series id) instead of a JSON round-trip per series.
+    """
     if not settings.fred_api_key:
         logger.warning("FRED API key not set — skipping")
         return []
 
+    try:
+        async with _HTTP_SEM:
+            resp = await client.get(
+                "https://fred.stlouisfed.org/graph/fredgraph.csv",
+                params={"id": ",".join(sid for sid, _ in _FRED_SERIES)},
+            )
+        resp.raise_for_status()
+        rows = list(csv.DictReader(resp.text.splitlines()))
+    except Exception:
+        logger.exception("FRED request failed")
+        return []
+
     articles: list[dict] = []
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        tasks = [
-            _fred_single_series(client, series_id, label, edition_id)
-            for series_id, label in _FRED_SERIES
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    for series_id, label in _FRED_SERIES:
+        # Walk from the newest row back to the latest real observation
+        # (missing values are ".")
+        value = date = None
+        for row in reversed(rows):
+            v = row.get(series_id)
+            if v and v != ".":
+                value = v
+                date = row.get("DATE") or row.get("observation_date") or "unknown"
+                break
+        if value is None:
+            logger.warning("FRED series %s had no observations", series_id)
+            continue
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                series_id = _FRED_SERIES[i][0]
-                logger.error("FRED series %s failed: %s", series_id, result)
-                continue
-            if result is not None:
-                articles.append(result)
+        suffix = "" if series_id == "CPIAUCSL" else "%"
+        articles.append({
+            "edition_id": edition_id,
+            "title": f"{label}: {value}{suffix} ({date})",
+            "url": f"https://fred.stlouisfed.org/series/{series_id}",
+            "source": "fred",
+            "source_tier": 1,
+            "relevance_category": "macro",
+            "raw_snippet": f"{label} ({series_id}): {value} as of {date}. Source: Federal Reserve Economic Data.",
+        })
 
     logger.info("FRED: %d data points retrieved", len(articles))
     return articles
@@ -1,12 +1,16 @@
 import asyncio
+import functools
 import logging
+import random
+import re
+import time
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from urllib.parse import urlparse
 
 import httpx
 
-from app.database import get_db
+from app.database import get_db, get_write_db
 
 logger = logging.getLogger(__name__)
 
@@ -14,85 +18,184 @@ logger = logging.getLogger(__name__)
 # Tier domain lists (easy to update)
 # ---------------------------------------------------------------------------
 
-_TIER_1_DOMAINS = {
+_TIER_1_DOMAINS = frozenset({
     "federalreserve.gov", "sec.gov", "finra.org", "treasury.gov", "bls.gov",
     "cbre.com", "jll.com", "cushmanwakefield.com",
     "bloomberg.com", "wsj.com", "ft.com", "reuters.com",
-}
+})
 
-_TIER_2_DOMAINS = {
+_TIER_2_DOMAINS = frozenset({
     "pere.com", "globest.com", "bisnow.com", "commercialobserver.com",
     "zawya.com", "preqin.com", "pitchbook.com", "nareit.com",
-}
+})
 
-_PAYWALL_DOMAINS = {
+_PAYWALL_DOMAINS = frozenset({
     "wsj.com", "ft.com", "bloomberg.com", "barrons.com",
     "economist.com", "nytimes.com",
-}
+})
 
 _TIER_WEIGHTS = {1: 1.0, 2: 0.7, 3: 0.3}
 
+
+class DomainTrie:
+    """Reverse-label trie classifying a domain in one walk.
+
+    Domains are inserted by their dot-separated labels in reverse
+    ("wsj.com" -> com -> wsj) with (tier, paywalled) flags at terminal
+    nodes, so lookup cost is O(labels) regardless of how many domains
+    are registered, and subdomains match for free.
+    """
+
+    def __init__(self) -> None:
+        self._root: dict = {}
+
+    def insert(self, domain: str, *, tier: int | None = None,
+               paywalled: bool = False) -> None:
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        flags = node.setdefault("", [None, False])
+        if tier is not None:
+            flags[0] = tier
+        if paywalled:
+            flags[1] = True
+
+    def classify(self, domain: str) -> tuple[int | None, bool]:
+        """Return (tier or None, is_paywalled) for a domain.
+
+        The deepest terminal on the walk wins, so an exact entry
+        overrides a parent-domain entry.
+        """
+        tier: int | None = None
+        paywalled = False
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            flags = node.get("")
+            if flags is not None:
+                if flags[0] is not None:
+                    tier = flags[0]
+                if flags[1]:
+                    paywalled = True
+        return tier, paywalled
+
+
+def _build_domain_trie() -> DomainTrie:
+    trie = DomainTrie()
+    for domain in _TIER_1_DOMAINS:
+        trie.insert(domain, tier=1)
+    for domain in _TIER_2_DOMAINS:
+        trie.insert(domain, tier=2)
+    for domain in _PAYWALL_DOMAINS:
+        trie.insert(domain, paywalled=True)
+    return trie
+
+
+_DOMAIN_TRIE = _build_domain_trie()
+
 _LINK_TIMEOUT = httpx.Timeout(5.0, connect=3.0)
-_LINK_SEMAPHORE_LIMIT = 10
+# Wide global cap, narrow per-domain cap: ten different hosts check in
+# parallel instead of queueing behind whichever host is slow
+_LINK_SEMAPHORE_LIMIT = 32
+_LINK_PER_DOMAIN_LIMIT = 2
+# Consecutive failures from one domain before remaining URLs on that
+# domain are failed without a network call
+_LINK_CIRCUIT_LIMIT = 3
+
+# Lazily built client reused across editions: keepalive + HTTP/2 let
+# repeated checks against the same origins share connections instead of
+# re-handshaking every pipeline run. Closed from the app lifespan.
+_link_client: httpx.AsyncClient | None = None
+
+
+def _get_link_client() -> httpx.AsyncClient:
+    global _link_client
+    if _link_client is None:
+        _link_client = httpx.AsyncClient(
+            http2=True,
+            timeout=_LINK_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=_LINK_SEMAPHORE_LIMIT,
+                max_keepalive_connections=_LINK_SEMAPHORE_LIMIT,
+                keepalive_expiry=30,
+            ),
+        )
+    return _link_client
+
+
+# Domains observed to reject HEAD (405/501 or any 4xx/5xx on HEAD):
+# subsequent checks go straight to a byte-range GET, one round-trip
+# instead of two. Persists across editions within the process.
+_head_averse_domains: set[str] = set()
+
+# First byte only — keeps the fallback GET from downloading full bodies
+_RANGE_HEADERS = {"Range": "bytes=0-0"}
+
+
+async def close_link_client() -> None:
+    """Close the shared link-validation client. Called on app shutdown."""
+    global _link_client
+    if _link_client is not None:
+        await _link_client.aclose()
+        _link_client = None
 
 
 # ============================= PUBLIC API ==================================
 
 
-async def run_verification(edition_id: int) -> None:
+async def run_verification(edition_id: int, *, full_validate: bool = False) -> None:
     """Run all verification checks on articles for an edition.
 
-    Checks run in order: tier classification → link validation →
-    paywall detection → deduplication → quality scoring.
+    Checks run: tier + paywall classification → deduplication →
+    link validation (overlapped with saving the classification) →
+    quality scoring. Duplicates score 0.0 and never reach a draft, so
+    their URLs are not validated unless full_validate is set (QA runs).
     """
-    db = await get_db()
-    try:
+    async with get_db() as db:
         cursor = await db.execute(
             "SELECT id, title, url, source, source_tier, is_paywalled, "
-            "is_duplicate, quality_score, retrieved_at "
+            "is_duplicate, quality_score, retrieved_at, retrieved_at_epoch "
             "FROM articles WHERE edition_id = ?",
             (edition_id,),
         )
         rows = await cursor.fetchall()
-    finally:
-        await db.close()
 
     if not rows:
         logger.info("Edition %d: no articles to verify", edition_id)
         return
 
-    # Convert Row objects to mutable dicts
+    # Convert Row objects to mutable dicts, resolving each article's
+    # domain exactly once for every downstream check
     articles = [dict(row) for row in rows]
+    for article in articles:
+        article["_domain"] = _extract_domain(article["url"]) if article["url"] else None
     logger.info("Edition %d: verifying %d articles", edition_id, len(articles))
 
-    # Check A — Tier classification
-    _classify_tiers(articles)
-
-    # Check B — Link validation
-    await _validate_links(articles)
-
-    # Check C — Paywall detection
-    _detect_paywalls(articles)
+    # Checks A + C fused — tier classification and paywall detection
+    # share one pass (and one domain lookup) per article
+    _classify_articles(articles)
 
-    # Check D — Deduplication
+    # Check D — Deduplication (CPU-only; independent of link state)
     _deduplicate(articles)
 
-    # Check E — Quality scoring
-    _compute_scores(articles)
-
-    # Save results
-    await _save_verification_results(articles)
+    # Check B — Link validation overlaps with persisting the fields
+    # that are already final (tier/paywall/duplicate); the reader/writer
+    # split means the network wait and the write don't contend
+    if full_validate:
+        to_validate = articles
+    else:
+        to_validate = [a for a in articles if not a.get("is_duplicate")]
+    await asyncio.gather(
+        _validate_links(to_validate),
+        _save_classification(articles),
+    )
 
-    # Log summary
-    tier_counts = {1: 0, 2: 0, 3: 0}
-    paywalled = 0
-    duplicates = 0
-    for a in articles:
-        tier_counts[a["source_tier"]] = tier_counts.get(a["source_tier"], 0) + 1
-        if a["is_paywalled"]:
-            paywalled += 1
-        if a["is_duplicate"]:
-            duplicates += 1
+    # Check E — Quality scoring, fused with the summary counters
+    tier_counts, paywalled, duplicates = _compute_scores(articles)
+    await _save_scores(articles)
 
     logger.info(
         "Edition %d verification complete: tiers=%s, paywalled=%d, duplicates=%d",
@@ -103,8 +206,12 @@ async def run_verification(edition_id: int) -> None:
 # ============================= HELPERS =====================================
 
 
+@functools.lru_cache(maxsize=4096)
 def _extract_domain(url: str) -> str | None:
-    """Extract the domain from a URL, stripping www. prefix."""
+    """Extract the domain from a URL, stripping www. prefix.
+
+    Memoized — the same URLs recur across verification runs.
+    """
     try:
         netloc = urlparse(url).netloc.lower()
         if netloc.startswith("www."):
@@ -114,45 +221,32 @@ def _extract_domain(url: str) -> str | None:
         return None
 
 
-def _domain_matches(domain: str, domain_set: set[str]) -> bool:
-    """Check if domain matches any entry in the set (including subdomains)."""
-    if domain in domain_set:
-        return True
-    # Check if domain is a subdomain of any entry
-    for entry in domain_set:
-        if domain.endswith("." + entry):
-            return True
-    return False
+# ============================= CHECKS A + C: TIER + PAYWALL ================
 
 
-# ============================= CHECK A: TIER CLASSIFICATION ================
-
-
-def _classify_tiers(articles: list[dict]) -> None:
-    """Classify each article into Tier 1, 2, or 3 based on URL domain."""
+def _classify_articles(articles: list[dict]) -> None:
+    """Classify tier and paywall status in a single pass over the articles."""
+    paywalled = 0
     for article in articles:
         # FRED and EDGAR are always Tier 1
         if article["source"] in ("fred", "edgar"):
             article["source_tier"] = 1
             continue
 
-        url = article.get("url")
-        if not url:
-            # No URL — keep existing tier (set at retrieval)
-            continue
-
-        domain = _extract_domain(url)
+        domain = article["_domain"]
         if not domain:
+            # No URL/domain — keep existing tier (set at retrieval)
             continue
 
-        if _domain_matches(domain, _TIER_1_DOMAINS):
-            article["source_tier"] = 1
-        elif _domain_matches(domain, _TIER_2_DOMAINS):
-            article["source_tier"] = 2
-        else:
-            article["source_tier"] = 3
+        tier, is_paywalled = _DOMAIN_TRIE.classify(domain)
+        article["source_tier"] = tier if tier is not None else 3
+        if is_paywalled:
+            article["is_paywalled"] = 1
+            paywalled += 1
 
-    logger.info("Tier classification complete")
+    logger.info(
+        "Tier + paywall classification complete: %d paywalled", paywalled
+    )
 
 
 # ============================= CHECK B: LINK VALIDATION ====================
@@ -165,11 +259,13 @@ async def _validate_links(articles: list[dict]) -> None:
     known paywall domains (they block automated requests but are live).
     Skips known Tier 1/2 domains (many block automated requests with
     401/403) and paywall domains. Falls back to GET if HEAD returns
-    a 4xx/5xx status for unknown domains.
+    a 4xx/5xx status for unknown domains. A domain that fails
+    _LINK_CIRCUIT_LIMIT times in a row has its remaining URLs failed
+    without further requests.
     """
-    # Combine all trusted domains — these block automated requests
-    _TRUSTED_DOMAINS = _TIER_1_DOMAINS | _TIER_2_DOMAINS | _PAYWALL_DOMAINS
-    semaphore = asyncio.Semaphore(_LINK_SEMAPHORE_LIMIT)
+    global_sem = asyncio.Semaphore(_LINK_SEMAPHORE_LIMIT)
+    domain_sems: dict[str, asyncio.Semaphore] = {}
+    failure_counts: dict[str, int] = {}
 
     async def check_one(article: dict, client: httpx.AsyncClient) -> None:
         url = article.get("url")
@@ -180,27 +276,46 @@ async def _validate_links(articles: list[dict]) -> None:
             return
 
         # Skip: known Tier 1/2 and paywall domains (block automated requests)
-        domain = _extract_domain(url)
-        if domain and _domain_matches(domain, _TRUSTED_DOMAINS):
-            article["link_valid"] = True
+        domain = article["_domain"]
+        if domain:
+            tier, paywalled = _DOMAIN_TRIE.classify(domain)
+            if tier is not None or paywalled:
+                article["link_valid"] = True
+                return
+
+        # Circuit breaker: a consistently failing domain stops costing
+        # network round-trips for the rest of the run
+        if domain and failure_counts.get(domain, 0) >= _LINK_CIRCUIT_LIMIT:
+            article["link_valid"] = False
             return
 
-        async with semaphore:
+        domain_sem = domain_sems.setdefault(
+            domain or "", asyncio.Semaphore(_LINK_PER_DOMAIN_LIMIT)
+        )
+        async with domain_sem, global_sem:
             try:
-                resp = await client.head(url)
-                if resp.status_code >= 400:
-                    # HEAD blocked or failed — try GET as fallback
-                    resp = await client.get(url, follow_redirects=True)
+                if domain in _head_averse_domains:
+                    resp = await client.get(url, headers=_RANGE_HEADERS)
+                else:
+                    resp = await client.head(url)
+                    if resp.status_code >= 400:
+                        # HEAD blocked — remember it and fall back to a
+                        # single-byte GET
+                        if domain:
+                            _head_averse_domains.add(domain)
+                        resp = await client.get(url, headers=_RANGE_HEADERS)
                 article["link_valid"] = resp.status_code < 400
             except Exception:
                 article["link_valid"] = False
+        if domain:
+            if article["link_valid"]:
+                failure_counts.pop(domain, None)
+            else:
+                failure_counts[domain] = failure_counts.get(domain, 0) + 1
 
-    async with httpx.AsyncClient(
-        timeout=_LINK_TIMEOUT,
-        follow_redirects=True,
-    ) as client:
-        tasks = [check_one(a, client) for a in articles]
-        await asyncio.gather(*tasks, return_exceptions=True)
+    client = _get_link_client()
+    tasks = [check_one(a, client) for a in articles]
+    await asyncio.gather(*tasks, return_exceptions=True)
 
     valid = sum(1 for a in articles if a.get("link_valid", True))
     logger.info(
@@ -208,66 +323,171 @@ async def _validate_links(articles: list[dict]) -> None:
     )
 
 
-# ============================= CHECK C: PAYWALL DETECTION ==================
+# ============================= CHECK D: DEDUPLICATION ======================
 
 
-def _detect_paywalls(articles: list[dict]) -> None:
-    """Mark articles from known paywall domains."""
-    count = 0
-    for article in articles:
-        url = article.get("url")
-        if not url:
-            continue
+_SIM_THRESHOLD = 0.75
+_WS_RE = re.compile(r"\s+")
+# Below this size the O(n^2) pairwise comparison is cheaper than
+# building MinHash signatures
+_MINHASH_MIN_ARTICLES = 50
+_NUM_HASHES = 64
+_NUM_BANDS = 16  # 16 bands x 4 rows per signature
+_JACCARD_GATE = 0.6
+_MINHASH_SALTS = tuple(
+    random.Random(0x5EED).getrandbits(64) for _ in range(_NUM_HASHES)
+)
 
-        domain = _extract_domain(url)
-        if domain and _domain_matches(domain, _PAYWALL_DOMAINS):
-            article["is_paywalled"] = 1
-            count += 1
 
-    logger.info("Paywall detection complete: %d paywalled", count)
+def _deduplicate(articles: list[dict]) -> None:
+    """Mark duplicate articles based on title similarity.
 
+    Similar pairs are collected (pairwise for small batches, MinHash/
+    LSH candidates for larger ones), clustered with union-find so
+    chains like A~B~C resolve consistently regardless of comparison
+    order, and each cluster keeps its best-tier article. Re-runs
+    recompute from scratch, so the result is idempotent.
+    """
+    for article in articles:
+        article["is_duplicate"] = 0
 
-# ============================= CHECK D: DEDUPLICATION ======================
+    if len(articles) < _MINHASH_MIN_ARTICLES:
+        pairs = _similar_pairs_pairwise(articles)
+    else:
+        pairs = _similar_pairs_lsh(articles)
 
+    count = _mark_duplicate_clusters(articles, pairs)
+    logger.info("Deduplication complete: %d duplicates found", count)
 
-def _deduplicate(articles: list[dict]) -> None:
-    """Mark duplicate articles based on title similarity."""
-    count = 0
-    for i, a in enumerate(articles):
-        if a.get("is_duplicate"):
-            continue
+
+def _similar_pairs_pairwise(articles: list[dict]) -> list[tuple[int, int]]:
+    # Normalize each title once (lowercase, collapsed whitespace) rather
+    # than re-lowercasing inside the O(n^2) loop
+    norm = [_WS_RE.sub(" ", a["title"].lower().strip()) for a in articles]
+    lengths = [len(t) for t in norm]
+
+    pairs: list[tuple[int, int]] = []
+    for i in range(len(articles)):
         for j in range(i + 1, len(articles)):
-            b = articles[j]
-            if b.get("is_duplicate"):
+            # ratio() is bounded by 2*min(la,lb)/(la+lb); an integer
+            # compare rejects length-mismatched pairs before a
+            # SequenceMatcher is even constructed (ratio > 0.75 needs
+            # 8*min > 3*(la+lb))
+            la, lb = lengths[i], lengths[j]
+            if 8 * min(la, lb) <= 3 * (la + lb):
                 continue
 
-            ratio = SequenceMatcher(
-                None, a["title"].lower(), b["title"].lower()
-            ).ratio()
-
-            if ratio > 0.75:
-                # Mark the lower-tier article as duplicate
-                # Higher tier number = lower quality tier
-                if a["source_tier"] > b["source_tier"]:
-                    a["is_duplicate"] = 1
-                    count += 1
-                    break  # a is marked, stop comparing it
-                else:
-                    b["is_duplicate"] = 1
-                    count += 1
+            # The O(1)/O(n) upper bounds prune almost every non-match
+            # before the full quadratic ratio runs
+            sm = SequenceMatcher(None, norm[i], norm[j])
+            if sm.real_quick_ratio() <= _SIM_THRESHOLD:
+                continue
+            if sm.quick_ratio() <= _SIM_THRESHOLD:
+                continue
 
-    logger.info("Deduplication complete: %d duplicates found", count)
+            if sm.ratio() > _SIM_THRESHOLD:
+                pairs.append((i, j))
+    return pairs
+
+
+def _minhash_signature(title: str) -> tuple[int, ...]:
+    """64-int MinHash signature over character 3-grams of the title."""
+    grams = {title[i:i + 3] for i in range(len(title) - 2)} or {title}
+    gram_hashes = [hash(g) for g in grams]
+    return tuple(
+        min(h ^ salt for h in gram_hashes) for salt in _MINHASH_SALTS
+    )
+
+
+def _similar_pairs_lsh(articles: list[dict]) -> list[tuple[int, int]]:
+    """Candidate generation via LSH banding, then pairwise confirmation."""
+    titles = [a["title"].lower() for a in articles]
+    signatures = [_minhash_signature(t) for t in titles]
+
+    rows_per_band = _NUM_HASHES // _NUM_BANDS
+    buckets: dict[tuple, list[int]] = {}
+    for idx, sig in enumerate(signatures):
+        for band in range(_NUM_BANDS):
+            key = (band, sig[band * rows_per_band:(band + 1) * rows_per_band])
+            buckets.setdefault(key, []).append(idx)
+
+    candidates: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) > 1:
+            for i, idx_a in enumerate(members):
+                for idx_b in members[i + 1:]:
+                    candidates.add((idx_a, idx_b))
+
+    pairs: list[tuple[int, int]] = []
+    for i, j in sorted(candidates):
+        estimated = sum(
+            x == y for x, y in zip(signatures[i], signatures[j])
+        ) / _NUM_HASHES
+        if estimated < _JACCARD_GATE:
+            continue
+        if SequenceMatcher(None, titles[i], titles[j]).ratio() > _SIM_THRESHOLD:
+            pairs.append((i, j))
+    return pairs
+
+
+def _mark_duplicate_clusters(
+    articles: list[dict], pairs: list[tuple[int, int]]
+) -> int:
+    """Union similar pairs into clusters; keep the best tier per cluster.
+
+    Returns the number of articles marked duplicate.
+    """
+    parent = list(range(len(articles)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    clusters: dict[int, list[int]] = {}
+    for idx in range(len(articles)):
+        clusters.setdefault(find(idx), []).append(idx)
+
+    count = 0
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        # Lowest tier number wins; earliest insertion breaks ties
+        keeper = min(members, key=lambda m: (articles[m]["source_tier"], m))
+        for member in members:
+            if member != keeper:
+                articles[member]["is_duplicate"] = 1
+                count += 1
+    return count
 
 
 # ============================= CHECK E: QUALITY SCORING ====================
 
 
-def _compute_scores(articles: list[dict]) -> None:
-    """Compute quality_score for each article."""
+def _compute_scores(articles: list[dict]) -> tuple[dict[int, int], int, int]:
+    """Compute quality_score per article, accumulating the summary counters.
+
+    Returns (tier_counts, paywalled, duplicates) so the caller doesn't
+    re-walk the list just to log totals.
+    """
     now = datetime.now()
+    now_epoch = time.time()
+    tier_counts = {1: 0, 2: 0, 3: 0}
+    paywalled = 0
+    duplicates = 0
 
     for article in articles:
+        tier_counts[article["source_tier"]] = tier_counts.get(article["source_tier"], 0) + 1
+        if article.get("is_paywalled"):
+            paywalled += 1
         if article.get("is_duplicate"):
+            duplicates += 1
             article["quality_score"] = 0.0
             continue
 
@@ -275,19 +495,24 @@ def _compute_scores(articles: list[dict]) -> None:
         tier = article.get("source_tier", 3)
         tier_weight = _TIER_WEIGHTS.get(tier, 0.3)
 
-        # Recency score
-        retrieved_at = article.get("retrieved_at")
-        if retrieved_at:
-            try:
-                if isinstance(retrieved_at, str):
-                    retrieved_dt = datetime.fromisoformat(retrieved_at)
-                else:
-                    retrieved_dt = retrieved_at
-                age = now - retrieved_dt
-            except (ValueError, TypeError):
-                age = timedelta(days=0)
+        # Recency score — integer math on the epoch column when present,
+        # ISO parsing only for rows predating it
+        epoch = article.get("retrieved_at_epoch")
+        if epoch:
+            age = timedelta(seconds=max(0.0, now_epoch - epoch))
         else:
-            age = timedelta(days=0)
+            retrieved_at = article.get("retrieved_at")
+            if retrieved_at:
+                try:
+                    if isinstance(retrieved_at, str):
+                        retrieved_dt = datetime.fromisoformat(retrieved_at)
+                    else:
+                        retrieved_dt = retrieved_at
+                    age = now - retrieved_dt
+                except (ValueError, TypeError):
+                    age = timedelta(days=0)
+            else:
+                age = timedelta(days=0)
 
         if age < timedelta(days=3):
             recency_score = 1.0
@@ -315,22 +540,24 @@ def _compute_scores(articles: list[dict]) -> None:
         )
 
     logger.info("Quality scoring complete")
+    return tier_counts, paywalled, duplicates
 
 
 # ============================= DB UPDATE ===================================
 
 
-async def _save_verification_results(articles: list[dict]) -> None:
-    """Write verification results back to the articles table."""
-    db = await get_db()
-    try:
+async def _save_classification(articles: list[dict]) -> None:
+    """Persist the classification fields that are final before link checks."""
+    async with get_write_db() as db:
+        # BEGIN IMMEDIATE takes the write lock up front so the batch
+        # never starts on a deferred transaction it must upgrade mid-way
+        await db.execute("BEGIN IMMEDIATE")
         await db.executemany(
-            "UPDATE articles SET source_tier=?, quality_score=?, is_paywalled=?, is_duplicate=? "
+            "UPDATE articles SET source_tier=?, is_paywalled=?, is_duplicate=? "
             "WHERE id=?",
             [
                 (
                     a["source_tier"],
-                    a["quality_score"],
                     a.get("is_paywalled", 0),
                     a.get("is_duplicate", 0),
                     a["id"],
@@ -339,7 +566,18 @@ async def _save_verification_results(articles: list[dict]) -> None:
             ],
         )
         await db.commit()
-    finally:
-        await db.close()
 
-    logger.info("Verification results saved for %d articles", len(articles))
+    logger.info("Classification saved for %d articles", len(articles))
+
+
+async def _save_scores(articles: list[dict]) -> None:
+    """Persist the link-dependent quality scores."""
+    async with get_write_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.executemany(
+            "UPDATE articles SET quality_score=? WHERE id=?",
+            [(a["quality_score"], a["id"]) for a in articles],
+        )
+        await db.commit()
+
+    logger.info("Scores saved for %d articles", len(articles))